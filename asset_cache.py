@@ -0,0 +1,177 @@
+# asset_cache.py
+# Baked image cache. The first run (or `python asset_cache.py`) stores every
+# image the game loads as final, scaled, display-format pixels in one packed
+# file; later runs memory-map that file and wrap the pixels as Surfaces, with
+# no PNG decode and no rescale. Each entry records a hash of its source file,
+# so edited art is decoded and baked again.
+#
+#   python asset_cache.py          rebuild the cache from scratch
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+
+import pygame
+
+from settings import ASSET_CACHE, ASSET_CACHE_PATH
+
+MAGIC = b'SVPK'
+VERSION = 1
+HEADER = struct.Struct('<4sII')  # Magic, version, index length
+ALIGN = 16
+PIXEL_FORMAT = 'BGRA'  # Byte order of 32-bit ARGB, the usual display format for alpha surfaces
+
+
+def file_hash(path):
+    with open(path, 'rb') as source:
+        return hashlib.blake2b(source.read(), digest_size=16).hexdigest()
+
+
+def cache_key(path, scale):
+    return f"{path}@{scale[0]}x{scale[1]}" if scale else path
+
+
+class BakedImages:
+    def __init__(self, path=ASSET_CACHE_PATH, enabled=ASSET_CACHE):
+        self.path = path
+        self.enabled = enabled
+        self.index = {}  # Key -> (source hash, offset from data_start, width, height) in the mapped pack
+        self.data_start = 0
+        self.pack = None  # Copy-on-write mmap of the pack; Surfaces read their pixels straight from it
+        self.pending = {}  # Key -> (source hash, Surface) decoded this run and not yet written
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.display_masks = None
+        if enabled:
+            self.open()
+
+    def open(self):
+        try:
+            with open(self.path, 'rb') as pack_file:
+                magic, version, index_length = HEADER.unpack(pack_file.read(HEADER.size))
+                if magic != MAGIC or version != VERSION:
+                    return
+                index = json.loads(pack_file.read(index_length))
+                # ACCESS_COPY: frombuffer needs a writable buffer, and nothing is ever written back
+                self.pack = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError, struct.error):
+            return  # No cache yet, or an unreadable one: it is rebuilt as images load
+        self.index = {key: tuple(entry) for key, entry in index.items()}
+        self.data_start = HEADER.size + index_length
+
+    def lookup(self, path, scale):
+        """Hash the source and find its entry: (key, source hash, entry or None). Safe on any thread."""
+        key = cache_key(path, scale)
+        source_hash = file_hash(path)
+        entry = self.index.get(key)
+        if entry is not None and entry[0] != source_hash:
+            entry = None  # The art changed since it was baked
+        return key, source_hash, entry
+
+    def add(self, key, source_hash, surface):
+        # A freshly decoded image, written to the pack by the next save()
+        with self.lock:
+            self.misses += 1
+            self.pending[key] = (source_hash, surface)
+
+    def load(self, path, scale, decode):
+        """The image at `path`, scaled to `scale`, from the pack when its source is unchanged, else from decode()."""
+        if not self.enabled:
+            return decode()
+        key, source_hash, entry = self.lookup(path, scale)
+        if entry is not None:
+            return self.wrap(*entry[1:])
+        surface = decode()
+        self.add(key, source_hash, surface)
+        return surface
+
+    def wrap(self, offset, width, height):
+        self.hits += 1
+        start = self.data_start + offset
+        pixels = memoryview(self.pack)[start:start + width * height * 4]
+        surface = pygame.image.frombuffer(pixels, (width, height), PIXEL_FORMAT)
+        if self.display_masks is None:
+            self.display_masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+        if surface.get_masks() != self.display_masks:
+            surface = surface.convert_alpha()  # A display with another pixel layout: one cheap conversion
+        return surface
+
+    def save(self):
+        """Write the pack again if this run decoded anything; a no-op once the cache is warm."""
+        if not self.enabled:
+            return False
+        with self.lock:
+            if not self.pending:
+                return False
+            pending, self.pending = self.pending, {}
+        blobs = {}
+        for key, (source_hash, offset, width, height) in self.index.items():
+            if key not in pending:
+                start = self.data_start + offset
+                blobs[key] = (source_hash, width, height, self.pack[start:start + width * height * 4])
+        for key, (source_hash, surface) in pending.items():
+            width, height = surface.get_size()
+            blobs[key] = (source_hash, width, height, pygame.image.tobytes(surface, PIXEL_FORMAT))
+
+        # Lay the blobs out after the header and index, each aligned; the index holds their offsets
+        index = {}
+        offset = 0
+        for key, (source_hash, width, height, data) in blobs.items():
+            index[key] = (source_hash, offset, width, height)
+            offset += -(-len(data) // ALIGN) * ALIGN
+        index_bytes = json.dumps(index).encode()
+        data_start = -(-(HEADER.size + len(index_bytes)) // ALIGN) * ALIGN
+        index_bytes = index_bytes.ljust(data_start - HEADER.size)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as pack_file:
+            pack_file.write(HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+            pack_file.write(index_bytes)
+            for key, (source_hash, width, height, data) in blobs.items():
+                pack_file.seek(data_start + index[key][1])
+                pack_file.write(data)
+        try:
+            os.replace(temporary, self.path)
+        except OSError:
+            os.remove(temporary)  # The old pack is still mapped (Windows); the offline bake can replace it
+            return False
+        # Map the new pack so a later save keeps these entries; Surfaces already made hold on to the old map
+        self.open()
+        return True
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.index)}
+
+
+# Shared by game_assets.load_image
+baked_images = BakedImages()
+
+
+def bake():
+    # Decode every image the game uses into a fresh pack, ignoring whatever cache is there.
+    # Goes through game_assets, as running this file makes a second copy of this module as __main__.
+    import game_assets
+
+    baked = game_assets.baked_images
+    if baked.pack is not None:
+        baked.pack.close()  # Nothing was loaded from it yet, and Windows can't replace a mapped file
+        baked.pack = None
+    baked.index = {}
+    registry = game_assets.AssetRegistry()
+    for mode in registry.manifests:
+        registry.preload(mode)
+    baked.save()
+    return baked.misses
+
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # convert_alpha() needs a display
+    print(f"baked {bake()} images into {ASSET_CACHE_PATH}")
@@ -0,0 +1,81 @@
+# atlas.py
+# Texture atlas: many small images packed onto one sheet. Each packed image
+# is handed out as a subsurface view of the sheet, in the same shape it was
+# given (a Surface, a list of frames, a dict of frame lists), so code using
+# the images doesn't change. Hot batched draws can blit straight from the
+# sheet with an area rect instead (see blit_source).
+import pygame
+
+from settings import ATLAS_WIDTH
+
+PADDING = 1  # Transparent pixels between packed images, so filtering never bleeds a neighbour in
+
+
+def flatten(name, item):
+    # (path, Surface) for every Surface in a packed item, e.g. 'explosion_frames/large/3'
+    if isinstance(item, pygame.Surface):
+        yield name, item
+    elif isinstance(item, dict):
+        for key, value in item.items():
+            yield from flatten(f'{name}/{key}', value)
+    else:
+        for i, value in enumerate(item):
+            yield from flatten(f'{name}/{i}', value)
+
+
+def shelf_pack(sizes, max_width=ATLAS_WIDTH, padding=PADDING):
+    """Positions for rects of the given sizes on shelves no wider than max_width, and the sheet size."""
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+    positions = [None] * len(sizes)
+    x = y = shelf_height = width = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w > max_width:
+            # Next shelf; tallest images come first, so each shelf is as high as its first image
+            y += shelf_height + padding
+            x = shelf_height = 0
+        positions[i] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+        width = max(width, x - padding)
+    return positions, (width, y + shelf_height)
+
+
+class Atlas:
+    def __init__(self, items, max_width=ATLAS_WIDTH):
+        """Pack `items`, a dict of name -> Surface, list of Surfaces or dict of those."""
+        leaves = [leaf for name, item in items.items() for leaf in flatten(name, item)]
+        positions, size = shelf_pack([surface.get_size() for _, surface in leaves], max_width)
+        self.sheet = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        self.rects = {}  # Path -> Rect on the sheet
+        for (path, surface), position in zip(leaves, positions):
+            # RGBA_MAX onto the transparent sheet copies pixels and alpha exactly, with no blending
+            self.rects[path] = self.sheet.blit(surface, position, special_flags=pygame.BLEND_RGBA_MAX)
+        self.views = {name: self.view(name, item) for name, item in items.items()}
+
+    def view(self, path, item):
+        # Same shape as the packed item, made of subsurfaces of the sheet
+        if isinstance(item, pygame.Surface):
+            return self.sheet.subsurface(self.rects[path])
+        if isinstance(item, dict):
+            return {key: self.view(f'{path}/{key}', value) for key, value in item.items()}
+        return [self.view(f'{path}/{i}', value) for i, value in enumerate(item)]
+
+    def __getitem__(self, name):
+        return self.views[name]
+
+    def __contains__(self, name):
+        return name in self.views
+
+    def occupancy(self):
+        # Share of the sheet covered by images
+        used = sum(rect.w * rect.h for rect in self.rects.values())
+        return used / (self.sheet.get_width() * self.sheet.get_height())
+
+
+def blit_source(image):
+    """(surface, area) to blit `image` from: for an atlas view its sheet and region, otherwise itself and None."""
+    parent = image.get_abs_parent()
+    if parent is image:
+        return image, None
+    return parent, pygame.Rect(image.get_abs_offset(), image.get_size())
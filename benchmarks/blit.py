@@ -0,0 +1,115 @@
+# benchmarks/blit.py
+# Cost of one blit of every loaded image onto the display, as loaded before
+# the display-format pass (a standalone convert_alpha() surface) and as the
+# asset registry hands it out now (convert() copies, colorkeyed RLE runs,
+# atlas views), plus the per-frame background of the game loops.
+#
+#   python -m benchmarks.blit
+#   python -m benchmarks.blit --blits 5000
+import argparse
+import os
+import random
+import time
+from itertools import cycle, islice
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from settings import WIDTH, HEIGHT
+
+BLACK = (0, 0, 0)
+
+
+def leaves(asset):
+    # Every Surface of an asset: one image, a frame list or a dict of frame lists
+    if isinstance(asset, pygame.Surface):
+        return [asset]
+    if isinstance(asset, dict):
+        return [surface for value in asset.values() for surface in leaves(value)]
+    if isinstance(asset, list):
+        return [surface for value in asset for surface in leaves(value)]
+    return []
+
+
+def kind(surface):
+    if surface.get_flags() & pygame.SRCALPHA:
+        return 'atlas view' if surface.get_parent() is not None else 'alpha'
+    return 'colorkey' if surface.get_colorkey() is not None else 'opaque'
+
+
+def time_blits(screen, surfaces, count):
+    # ms per blit, cycling through the frames at random positions
+    positions = [(random.randint(-20, WIDTH - 20), random.randint(-20, HEIGHT - 20)) for _ in range(count)]
+    jobs = list(zip(islice(cycle(surfaces), count), positions))
+    start = time.perf_counter()
+    screen.blits(jobs, doreturn=False)
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def time_frames(draw, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        draw()
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-asset blit cost before and after the display-format pass")
+    parser.add_argument('--blits', type=int, default=2000, help="blits timed per image")
+    parser.add_argument('--frames', type=int, default=200, help="frames timed per background")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    random.seed(args.seed)
+
+    from game_assets import LOADERS, assets
+    from render import Renderer
+
+    print(f"{'asset':<26} {'now':<11} {'before ms':>10} {'now ms':>10} {'speedup':>8}")
+    for name in LOADERS:
+        now = leaves(assets[name])
+        if not now or name == 'sprites':
+            continue
+        before = [surface.convert_alpha() for surface in now]  # Standalone per-pixel alpha, as load_image made them
+        before_ms = time_blits(screen, before, args.blits)
+        now_ms = time_blits(screen, now, args.blits)
+        print(f"{name:<26} {kind(now[0]):<11} {before_ms:>10.4f} {now_ms:>10.4f} {before_ms / now_ms:>7.1f}x")
+
+    print()
+    print(f"{'background, per frame':<26} {'':<11} {'before ms':>10} {'now ms':>10} {'speedup':>8}")
+    for name in ('game_background', 'versus_background'):
+        background = assets[name]
+        renderer = Renderer(screen, background, headless=True)
+
+        def before():
+            # What the loops did every frame: clear, then the background twice with per-pixel alpha
+            screen.fill(BLACK)
+            screen.blit(background, (-WIDTH // 3, 0))
+            screen.blit(background, (-WIDTH // 3 + WIDTH, 0))
+
+        before_ms = time_frames(before, args.frames)
+        now_ms = time_frames(lambda: renderer.paint_background(-WIDTH // 3), args.frames)
+        print(f"{name:<26} {'opaque':<11} {before_ms:>10.4f} {now_ms:>10.4f} {before_ms / now_ms:>7.1f}x")
+
+    scaled = assets['menu_background_scaled']
+    unflattened = pygame.transform.scale(assets['menu_background'], scaled.get_size())
+
+    def menu_before():
+        screen.fill(BLACK)
+        screen.blit(unflattened, (0, 0))
+
+    def menu_now():
+        screen.fill(BLACK)
+        screen.blit(scaled, (0, 0))
+
+    before_ms = time_frames(menu_before, args.frames)
+    now_ms = time_frames(menu_now, args.frames)
+    print(f"{'menu_background_scaled':<26} {'opaque':<11} {before_ms:>10.4f} {now_ms:>10.4f} {before_ms / now_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/collisions.py
+# Compare the brute-force pygame.sprite collision passes of game_loop with the
+# spatial hash broadphase, at increasing projectile counts.
+#
+#   python -m benchmarks.collisions
+#   python -m benchmarks.collisions --counts 100 1000 5000 10000 --frames 120
+import argparse
+import random
+import time
+
+import pygame
+
+from collision import Broadphase
+from settings import WIDTH, HEIGHT
+
+
+class Body(pygame.sprite.Sprite):
+    # Stand-in for ships, asteroids and sprite projectiles: a solid disc so collide_mask has real work to do
+    def __init__(self, size):
+        super().__init__()
+        self.image = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.ellipse(self.image, (255, 255, 255), self.image.get_rect())
+        self.rect = self.image.get_rect()
+
+
+def scatter(group):
+    for sprite in group:
+        sprite.rect.center = (random.randint(0, WIDTH), random.randint(0, HEIGHT))
+
+
+def build_scene(projectiles):
+    bullets = pygame.sprite.Group(Body((10, 5)) for _ in range(projectiles // 2))
+    enemy_bullets = pygame.sprite.Group(Body((10, 5)) for _ in range(projectiles - projectiles // 2))
+    enemies = pygame.sprite.Group(Body((114, 64)) for _ in range(30))
+    asteroids = pygame.sprite.Group(Body((s, s)) for s in (random.randint(20, 150) for _ in range(40)))
+    players = [Body((114, 64)), Body((114, 64))]
+    return bullets, enemy_bullets, enemies, asteroids, players
+
+
+def run_passes(collide, bullets, enemy_bullets, enemies, asteroids, players):
+    # The passes game_loop runs every frame, without killing so each frame does the same work
+    results = [
+        collide.groupcollide(enemies, bullets, False, False),
+        collide.groupcollide(asteroids, bullets, False, False),
+        collide.groupcollide(enemies, asteroids, False, False),
+    ]
+    for player in players:
+        results.append(collide.spritecollide(player, enemy_bullets, False, pygame.sprite.collide_mask))
+        results.append(collide.spritecollide(player, enemies, False, pygame.sprite.collide_mask))
+        results.append(collide.spritecollide(player, asteroids, False, pygame.sprite.collide_mask))
+    return results
+
+
+def bench(projectiles, frames):
+    scene = build_scene(projectiles)
+    bullets, enemy_bullets, enemies, asteroids, players = scene
+    broadphase = Broadphase()
+    brute_total = hash_total = 0.0
+    for _ in range(frames):
+        for group in (bullets, enemy_bullets, enemies, asteroids):
+            scatter(group)
+        for player in players:
+            player.rect.center = (random.randint(0, WIDTH), random.randint(0, HEIGHT))
+
+        start = time.perf_counter()
+        expected = run_passes(pygame.sprite, *scene)
+        brute_total += time.perf_counter() - start
+
+        start = time.perf_counter()
+        broadphase.rebuild(bullets, enemy_bullets, enemies, asteroids)
+        got = run_passes(broadphase, *scene)
+        hash_total += time.perf_counter() - start
+
+        if got != expected:
+            raise AssertionError(f"broadphase results differ from pygame.sprite at {projectiles} projectiles")
+    return brute_total * 1000 / frames, hash_total * 1000 / frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collision broadphase benchmark")
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    print(f"{'projectiles':>12} {'brute ms/frame':>15} {'hash ms/frame':>14} {'speedup':>8}")
+    for count in args.counts:
+        brute_ms, hash_ms = bench(count, args.frames)
+        print(f"{count:>12} {brute_ms:>15.3f} {hash_ms:>14.3f} {brute_ms / hash_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/projectiles.py
+# Frame cost of N live bullets: the old one-sprite-per-bullet path (update,
+# broadphase collisions, Group.draw) against the NumPy projectile store.
+# Bullets that die are replaced each frame so N stay live throughout.
+#
+#   python -m benchmarks.projectiles
+#   python -m benchmarks.projectiles --counts 1000 10000 20000 --frames 120
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from benchmarks.collisions import Body
+from collision import Broadphase, collide_mask
+from projectiles import Projectiles, PLAYER, ENEMY
+from settings import WIDTH, HEIGHT
+
+FRAME_MS = 1000 / 60
+
+
+class SpriteBullet(pygame.sprite.Sprite):
+    # The per-object bullet sprite the projectile store replaced
+    def __init__(self, image, x, y, speedx, speedy, cull_vertical):
+        super().__init__()
+        self.image = image
+        self.rect = image.get_rect(center=(x, y))
+        self.speedx = speedx
+        self.speedy = speedy
+        self.cull_vertical = cull_vertical
+
+    def update(self):
+        self.rect.x += self.speedx
+        self.rect.y += self.speedy
+        if self.rect.left > WIDTH or self.rect.right < 0:
+            self.kill()
+        elif self.cull_vertical and (self.rect.bottom < 0 or self.rect.top > HEIGHT):
+            self.kill()
+
+
+def random_shot(enemy):
+    x, y = random.randint(0, WIDTH), random.randint(0, HEIGHT)
+    speedx = random.uniform(-8, -4) if enemy else 10
+    return x, y, speedx, random.uniform(-2, 2)
+
+
+def build_targets():
+    enemies = pygame.sprite.Group(Body((114, 64)) for _ in range(30))
+    asteroids = pygame.sprite.Group(Body((s, s)) for s in (random.randint(20, 150) for _ in range(40)))
+    players = [Body((114, 64)), Body((114, 64))]
+    for sprite in [*enemies, *asteroids, *players]:
+        sprite.rect.center = (random.randint(0, WIDTH), random.randint(0, HEIGHT))
+    return enemies, asteroids, players
+
+
+def bench_sprites(count, frames, image, targets, surface):
+    enemies, asteroids, players = targets
+    bullets = pygame.sprite.Group()
+    enemy_bullets = pygame.sprite.Group()
+    broadphase = Broadphase()
+    total = 0.0
+    for _ in range(frames):
+        for _ in range(count - len(bullets) - len(enemy_bullets)):
+            enemy = random.random() < 0.5
+            bullet = SpriteBullet(image, *random_shot(enemy), enemy)
+            (enemy_bullets if enemy else bullets).add(bullet)
+
+        start = time.perf_counter()
+        bullets.update()
+        enemy_bullets.update()
+        broadphase.rebuild(bullets, enemy_bullets)
+        broadphase.groupcollide(enemies, bullets, False, True)
+        broadphase.groupcollide(asteroids, bullets, False, True)
+        for player in players:
+            broadphase.spritecollide(player, enemy_bullets, True, collide_mask)
+        bullets.draw(surface)
+        enemy_bullets.draw(surface)
+        total += time.perf_counter() - start
+    return total * 1000 / frames
+
+
+def bench_arrays(count, frames, image, targets, surface):
+    enemies, asteroids, players = targets
+    projectiles = Projectiles()
+    bullets = projectiles.group(PLAYER)
+    enemy_bullets = projectiles.group(ENEMY)
+    total = 0.0
+    for _ in range(frames):
+        for _ in range(count - len(projectiles)):
+            enemy = random.random() < 0.5
+            x, y, speedx, speedy = random_shot(enemy)
+            (enemy_bullets if enemy else bullets).fire(image, speedx, speedy, center=(x, y))
+
+        start = time.perf_counter()
+        projectiles.update()
+        bullets.collide_group(enemies)
+        bullets.collide_group(asteroids)
+        for player in players:
+            enemy_bullets.collide_mask(player)
+        projectiles.draw(surface)
+        total += time.perf_counter() - start
+    return total * 1000 / frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Projectile engine benchmark")
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 5000, 10000])
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    image = pygame.Surface((10, 5), pygame.SRCALPHA)
+    image.fill((255, 255, 0))
+
+    random.seed(args.seed)
+    targets = build_targets()
+    print(f"{'bullets':>8} {'sprites ms/frame':>17} {'arrays ms/frame':>16} {'speedup':>8} {'60 fps':>7}")
+    for count in args.counts:
+        sprite_ms = bench_sprites(count, args.frames, image, targets, surface)
+        array_ms = bench_arrays(count, args.frames, image, targets, surface)
+        fits = 'yes' if array_ms <= FRAME_MS else 'no'
+        print(f"{count:>8} {sprite_ms:>17.3f} {array_ms:>16.3f} {sprite_ms / array_ms:>7.1f}x {fits:>7}")
+
+
+if __name__ == "__main__":
+    main()
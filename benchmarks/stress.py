@@ -0,0 +1,379 @@
+# benchmarks/stress.py
+# Scripted worst cases built straight from game_classes: thousands of spread
+# bullets, asteroids breaking apart, homing rockets, bosses firing volleys and
+# the full star field, each alone and all at once. Every tick mirrors one step
+# of GameScene.update_playing and draw_fading, with update, collisions and
+# draw timed separately. Entities that die are replaced before each tick,
+# outside the timings, so the counts hold for the whole run. Each scenario
+# runs --repeats times from the same seed and the fastest run is kept, as
+# timeit does: the slower ones measure the machine, not the game.
+#
+#   python -m benchmarks.stress
+#   python -m benchmarks.stress --ticks 600 --json stress.json
+#   python -m benchmarks.stress --baseline stress.json --threshold 0.1
+#
+# --baseline takes any file written by --json; a phase whose median got slower
+# than the threshold allows is flagged and the exit status is 1.
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from settings import WIDTH, HEIGHT
+
+BULLETS = 2000  # Live player bullets in the spread scenario
+SPREAD_PICKUPS = 8  # Spread power-ups collected: 9 bullets per shot
+ASTEROIDS = 150  # Live asteroid pieces
+ROCKETS = 20  # Live homing rockets
+ROCKET_TARGETS = 30  # Enemy ships for the rockets to chase
+BOSSES = 5
+BOSS_LEVEL = 5  # A volley every 600 ms
+BOSS_HEALTH = 10 ** 9  # Bosses soak up every hit and never leave the scenario
+PHASES = ('update', 'collisions', 'draw')
+NOISE_FLOOR_MS = 0.05  # Medians this close to the baseline are never a regression, whatever the ratio
+
+
+class World:
+    # The groups of one GameScene round, without its spawn timers, scoring or game over
+    def __init__(self):
+        from collision import Broadphase, TargetIndex
+        from projectiles import Projectiles, PLAYER, ENEMY
+
+        self.all_sprites = pygame.sprite.Group()
+        self.rockets = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.combined_targets = pygame.sprite.Group()
+        self.projectiles = Projectiles()
+        self.bullets = self.projectiles.group(PLAYER)
+        self.enemy_bullets = self.projectiles.group(ENEMY)
+        self.target_index = TargetIndex(self.combined_targets)
+        self.broadphase = Broadphase()
+        self.players = []
+        self.stars = None
+        self.fillers = []  # Run before every tick to put the scenario's counts back
+
+    def fill(self):
+        for filler in self.fillers:
+            filler()
+
+    def add_player(self, bullets=None):
+        from game_assets import assets
+        from game_classes import Player
+
+        controls = {'up': pygame.K_w, 'down': pygame.K_s, 'left': pygame.K_a, 'right': pygame.K_d, 'speed': pygame.K_LSHIFT}
+        player = Player(
+            assets['player1_img'],
+            assets['player1_thruster_frames'],
+            bullets,
+            self.rockets,
+            self.all_sprites,
+            self.combined_targets,
+            assets,
+            controls,
+            target_index=self.target_index,
+            ship_frames=assets['player1_frames'],
+        )
+        self.players.append(player)
+        self.all_sprites.add(player)
+        return player
+
+    def add_enemy(self, sprite):
+        self.all_sprites.add(sprite)
+        self.enemies.add(sprite)
+        self.combined_targets.add(sprite)
+
+    def add_asteroid(self, sprite):
+        self.all_sprites.add(sprite)
+        self.asteroids.add(sprite)
+        self.combined_targets.add(sprite)
+
+    def entity_counts(self):
+        from game_classes import rocket_trails
+        return {
+            'sprites': len(self.all_sprites),
+            'bullets': len(self.bullets),
+            'enemy_bullets': len(self.enemy_bullets),
+            'asteroids': len(self.asteroids),
+            'rockets': len(self.rockets),
+            'enemies': len(self.enemies),
+            'trails': len(rocket_trails),
+            'stars': len(self.stars) if self.stars is not None else 0,
+        }
+
+    def clear(self):
+        from game_classes import rocket_trails
+        for sprite in self.all_sprites.sprites():
+            sprite.kill()  # Pooled explosions go back to their pool
+        rocket_trails.clear()
+
+
+def spread_bullets(world):
+    player = world.add_player(world.bullets)
+    for _ in range(SPREAD_PICKUPS):
+        player.increase_spread()
+
+    def fill():
+        # Shots from all over the left of the screen, so the spread fans cover it
+        while len(world.bullets) < BULLETS:
+            player.rect.center = (random.randint(100, WIDTH // 3), random.randint(0, HEIGHT))
+            player.last_shot = float('-inf')
+            player.shoot()
+    world.fillers.append(fill)
+
+
+def breaking_asteroids(world):
+    from game_assets import assets
+    from game_classes import Asteroid
+
+    def fill():
+        # Only the pieces: each parent has just split and its fragments are flying apart
+        while len(world.asteroids) < ASTEROIDS:
+            parent = Asteroid(assets['asteroid_img'], random.choice(('large', 'medium')))
+            parent.rect.center = (random.randint(0, WIDTH), random.randint(0, HEIGHT))
+            for piece in parent.break_apart():
+                world.add_asteroid(piece)
+    world.fillers.append(fill)
+
+
+def homing_rockets(world):
+    from game_assets import assets
+    from game_classes import Enemy, Rocket
+
+    targets = pygame.sprite.Group()  # This scenario's ships, apart from any bosses
+
+    def fill():
+        while len(targets) < ROCKET_TARGETS:
+            enemy = Enemy(assets['enemy_img'], world.enemy_bullets, world.all_sprites, assets, move_randomly=True)
+            enemy.rect.centerx = random.randint(WIDTH // 2, WIDTH)
+            world.add_enemy(enemy)
+            targets.add(enemy)
+        while len(world.rockets) < ROCKETS:
+            rocket = Rocket(
+                random.randint(0, WIDTH // 4), random.randint(0, HEIGHT), assets['rocket_img'],
+                world.combined_targets, assets, world.all_sprites, world.target_index,
+            )
+            world.rockets.add(rocket)
+            world.all_sprites.add(rocket)
+    world.fillers.append(fill)
+
+
+def boss_volleys(world):
+    from game_assets import assets
+    from game_classes import Boss
+    from sim_clock import sim_clock
+
+    world.add_player()  # Something for the volleys to hit; it never shoots
+    for i in range(BOSSES):
+        boss = Boss(assets['boss_img'], world.enemy_bullets, world.all_sprites, assets, BOSS_LEVEL)
+        boss.rect.right = WIDTH - 150  # Already in position
+        boss.rect.centery = HEIGHT * (i + 1) // (BOSSES + 1)
+        boss.speedx = 0
+        boss.health = BOSS_HEALTH
+        boss.last_shot = sim_clock.get_ticks() - boss.shoot_delay * i / BOSSES  # Staggered volleys
+        world.add_enemy(boss)
+
+
+def star_field(world):
+    from starfield import parallax_starfield
+    world.stars = parallax_starfield()
+
+
+def everything(world):
+    for build in (spread_bullets, breaking_asteroids, homing_rockets, boss_volleys, star_field):
+        build(world)
+
+
+# Scenario name -> function filling a fresh World
+SCENARIOS = {
+    'spread_bullets': spread_bullets,
+    'breaking_asteroids': breaking_asteroids,
+    'homing_rockets': homing_rockets,
+    'boss_volleys': boss_volleys,
+    'star_field': star_field,
+    'everything': everything,
+}
+
+
+def update(world):
+    from game_classes import rocket_trails
+    from sim_clock import sim_clock
+
+    sim_clock.tick()
+    world.target_index.invalidate()
+    rocket_trails.update()
+    world.projectiles.update()
+    world.all_sprites.update()
+    if world.stars is not None:
+        world.stars.update()
+
+
+def collide(world):
+    # The passes of GameScene.update_playing that these entities take part in; the players never die
+    from collision import collide_mask, collision_stats
+    from game_assets import assets
+    from game_classes import Boss, explosion_pool
+
+    explosion_frames = assets['explosion_frames']['normal']
+    broadphase = world.broadphase
+    broadphase.rebuild(world.rockets, world.enemies, world.asteroids)
+
+    for enemy_hit in world.bullets.collide_group(world.enemies):
+        if isinstance(enemy_hit, Boss):
+            enemy_hit.take_damage(1)
+        else:
+            enemy_hit.kill()
+            world.all_sprites.add(explosion_pool.acquire(enemy_hit.rect.center, explosion_frames))
+
+    for enemy_hit in broadphase.groupcollide(world.enemies, world.rockets, False, True):
+        if isinstance(enemy_hit, Boss):
+            enemy_hit.take_damage(4)
+        else:
+            enemy_hit.kill()
+            world.all_sprites.add(explosion_pool.acquire(enemy_hit.rect.center, explosion_frames))
+
+    for asteroid_hit in world.bullets.collide_group(world.asteroids, dokill=True):
+        world.all_sprites.add(explosion_pool.acquire(asteroid_hit.rect.center, explosion_frames))
+        for piece in asteroid_hit.break_apart():
+            world.add_asteroid(piece)
+            broadphase.add(world.asteroids, piece)
+
+    for asteroid_hit in broadphase.groupcollide(world.asteroids, world.rockets, True, True):
+        world.all_sprites.add(explosion_pool.acquire(asteroid_hit.rect.center, explosion_frames))
+
+    for player in world.players:
+        world.enemy_bullets.collide_mask(player)
+        broadphase.spritecollide(player, world.enemies, False, collide_mask)
+        broadphase.spritecollide(player, world.asteroids, False, collide_mask)
+    collision_stats.end_frame()
+
+
+def draw(world, screen, renderer):
+    # A full redraw, as draw_fading does it; the dirty-rect path would hide the cost of what moved
+    from game_classes import rocket_trails
+
+    renderer.paint_background()
+    if world.stars is not None:
+        world.stars.draw(screen)
+    world.all_sprites.draw(screen)
+    world.projectiles.draw(screen)
+    rocket_trails.draw(screen)
+
+
+def summarize(times):
+    times = np.asarray(times)
+    p50, p95, p99 = np.percentile(times, (50, 95, 99))
+    return {'mean': float(times.mean()), 'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(times.max())}
+
+
+def run_scenario(name, ticks, warmup, seed, screen, renderer):
+    """Build scenario `name` from `seed`, run warmup + ticks ticks and return its per-phase summary."""
+    from sim_clock import sim_clock
+
+    random.seed(seed)  # Each scenario is the same whichever others run before it
+    sim_clock.reset()
+    world = World()
+    SCENARIOS[name](world)
+    times = {phase: [] for phase in PHASES}
+    counts = None
+    for tick in range(warmup + ticks):
+        world.fill()
+        if tick == warmup:
+            counts = world.entity_counts()
+        start = time.perf_counter()
+        update(world)
+        updated = time.perf_counter()
+        collide(world)
+        collided = time.perf_counter()
+        draw(world, screen, renderer)
+        drawn = time.perf_counter()
+        if tick >= warmup:
+            times['update'].append((updated - start) * 1000)
+            times['collisions'].append((collided - updated) * 1000)
+            times['draw'].append((drawn - collided) * 1000)
+    world.clear()
+    sim_clock.reset()
+    totals = [sum(values) for values in zip(*times.values())]
+    return {'counts': counts, **{phase: summarize(values) for phase, values in times.items()}, 'total': summarize(totals)}
+
+
+def compare(results, baseline, threshold):
+    """Rows of (scenario, phase, baseline p50, now p50, ratio, regressed) for every phase both runs have."""
+    rows = []
+    for name, scenario in results['scenarios'].items():
+        old = baseline['scenarios'].get(name)
+        if old is None:
+            continue
+        for phase in (*PHASES, 'total'):
+            before, now = old[phase]['p50'], scenario[phase]['p50']
+            ratio = now / before if before > 0 else float('inf')
+            regressed = ratio > 1 + threshold and now - before > NOISE_FLOOR_MS
+            rows.append((name, phase, before, now, ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scripted stress scenarios: update, collision and draw cost per tick")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--ticks', type=int, default=300, help="timed ticks per scenario")
+    parser.add_argument('--warmup', type=int, default=30, help="untimed ticks first, to fill caches and pools")
+    parser.add_argument('--repeats', type=int, default=3, help="runs per scenario, the fastest is reported")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='PATH', help="write the results to PATH")
+    parser.add_argument('--baseline', metavar='PATH', help="compare against results written earlier with --json")
+    parser.add_argument('--threshold', type=float, default=0.15, help="flag medians this fraction slower than the baseline")
+    args = parser.parse_args(argv)
+
+    from main import init
+    screen = init()  # Loaded images are converted to this surface's format, as in the game
+    from game_assets import assets
+    from render import Renderer
+    assets.preload('survival')
+    renderer = Renderer(screen, assets['game_background'], headless=True)
+
+    results = {'ticks': args.ticks, 'warmup': args.warmup, 'repeats': args.repeats, 'seed': args.seed, 'scenarios': {}}
+    print(f"{'scenario':<20} {'update ms':>10} {'collide ms':>11} {'draw ms':>9} {'total ms':>9} {'p95 ms':>8}  counts")
+    # Repeats go round all the scenarios in turn, so a slow spell of the machine doesn't land on just one
+    runs = {name: [] for name in args.scenarios}
+    for _ in range(args.repeats):
+        for name in args.scenarios:
+            runs[name].append(run_scenario(name, args.ticks, args.warmup, args.seed, screen, renderer))
+    for name in args.scenarios:
+        scenario = min(runs[name], key=lambda run: run['total']['p50'])
+        results['scenarios'][name] = scenario
+        counts = ', '.join(f"{count} {group}" for group, count in scenario['counts'].items() if count)
+        print(
+            f"{name:<20} {scenario['update']['p50']:>10.3f} {scenario['collisions']['p50']:>11.3f} "
+            f"{scenario['draw']['p50']:>9.3f} {scenario['total']['p50']:>9.3f} {scenario['total']['p95']:>8.3f}  {counts}"
+        )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+        print("results written to", args.json)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        print()
+        print(f"{'scenario':<20} {'phase':<11} {'baseline ms':>12} {'now ms':>9} {'ratio':>7}")
+        for name, phase, before, now, ratio, regressed in rows:
+            flag = '  REGRESSION' if regressed else ''
+            print(f"{name:<20} {phase:<11} {before:>12.3f} {now:>9.3f} {ratio:>6.2f}x{flag}")
+        regressions = sum(row[-1] for row in rows)
+        print(f"{regressions} regression(s) beyond {args.threshold:.0%} against {args.baseline}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# collision.py
+# Uniform-grid spatial hash used as the broadphase for the collision passes in
+# game_loop. Broadphase.groupcollide/spritecollide return exactly what
+# pygame.sprite.groupcollide/spritecollide would, they just never test pairs
+# whose rects share no grid cell. TargetIndex answers nearest-target queries
+# for homing rockets from a grid over the target centres. collide_mask is the
+# pixel-perfect test, with masks cached per image instead of rebuilt per call.
+import math
+import weakref
+
+import pygame
+
+CELL_SIZE = 64  # Roughly the size of a ship; bullets cover one cell, large asteroids a few
+
+
+class CollisionStats:
+    """Per-frame counters for the narrow phase, so we can see how many mask tests really run."""
+
+    FIELDS = ('rect_tests', 'mask_tests', 'masks_built')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.totals = dict.fromkeys(self.FIELDS, 0)
+        self.current = dict.fromkeys(self.FIELDS, 0)
+        self.last_frame = dict.fromkeys(self.FIELDS, 0)
+
+    def end_frame(self):
+        for field, count in self.current.items():
+            self.totals[field] += count
+        self.last_frame = self.current
+        self.current = dict.fromkeys(self.FIELDS, 0)
+        self.frames += 1
+
+    def per_frame(self):
+        frames = max(1, self.frames)
+        return {field: count / frames for field, count in self.totals.items()}
+
+
+collision_stats = CollisionStats()
+
+# One mask per image, dropped together with the image
+_masks = weakref.WeakKeyDictionary()
+
+
+def get_mask(image):
+    mask = _masks.get(image)
+    if mask is None:
+        mask = _masks[image] = pygame.mask.from_surface(image)
+        collision_stats.current['masks_built'] += 1
+    return mask
+
+
+def collide_mask(left, right):
+    # Drop-in for pygame.sprite.collide_mask: reject on rects first, then test
+    # the sprite's own .mask if it keeps one, else the cached mask of its image.
+    # (Sprite rects are their image rects, so the rect test never drops a hit.)
+    counts = collision_stats.current
+    counts['rect_tests'] += 1
+    left_rect = left.rect
+    right_rect = right.rect
+    if not left_rect.colliderect(right_rect):
+        return False
+    counts['mask_tests'] += 1
+    left_mask = getattr(left, 'mask', None)
+    if left_mask is None:
+        left_mask = get_mask(left.image)
+    right_mask = getattr(right, 'mask', None)
+    if right_mask is None:
+        right_mask = get_mask(right.image)
+    return left_mask.overlap(right_mask, (right_rect.x - left_rect.x, right_rect.y - left_rect.y))
+
+
+class SpatialHash:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell x, cell y) -> sprites overlapping that cell
+        self.order = {}  # sprite -> insertion index, so queries come back in group order
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        # right/bottom are exclusive, so a rect ending on a cell edge stays out of the next cell
+        return (
+            rect.left // size,
+            rect.top // size,
+            max(rect.left, rect.right - 1) // size,
+            max(rect.top, rect.bottom - 1) // size,
+        )
+
+    def insert(self, sprite):
+        if sprite in self.order:
+            return
+        self.order[sprite] = len(self.order)
+        left, top, right, bottom = self.cell_range(sprite.rect)
+        cells = self.cells
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [sprite]
+                else:
+                    bucket.append(sprite)
+
+    def rebuild(self, sprites):
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, rect):
+        """Sprites sharing a cell with rect, in insertion order. Callers still do the exact test."""
+        left, top, right, bottom = self.cell_range(rect)
+        cells = self.cells
+        if left == right and top == bottom:
+            return cells.get((left, top), ())  # One cell: already unique and ordered
+
+        found = set()
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found, key=self.order.__getitem__)
+
+
+class Broadphase:
+    """One spatial hash per sprite group, rebuilt once per frame after the sprites have moved."""
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.indexes = {}  # group -> SpatialHash
+
+    def rebuild(self, *groups):
+        for group in groups:
+            index = self.indexes.get(group)
+            if index is None:
+                index = self.indexes[group] = SpatialHash(self.cell_size)
+            index.rebuild(group)
+
+    def add(self, group, sprite):
+        # Keep the index in step with sprites added to an indexed group mid-frame
+        index = self.indexes.get(group)
+        if index is not None:
+            index.insert(sprite)
+
+    def spritecollide(self, sprite, group, dokill, collided=None):
+        # Same contract as pygame.sprite.spritecollide. `collided` must only ever
+        # report hits for overlapping rects (true for collide_rect and collide_mask).
+        index = self.indexes.get(group)
+        if index is None:
+            return pygame.sprite.spritecollide(sprite, group, dokill, collided)
+
+        rect = sprite.rect
+        hits = []
+        for other in index.query(rect):
+            if other not in group.spritedict:
+                continue  # Killed or removed since the index was built
+            if collided is None:
+                if not rect.colliderect(other.rect):
+                    continue
+            elif not collided(sprite, other):
+                continue
+            if dokill:
+                other.kill()
+            hits.append(other)
+        return hits
+
+    def groupcollide(self, groupa, groupb, dokilla, dokillb, collided=None):
+        # Same contract as pygame.sprite.groupcollide, with groupb served from its index
+        if groupb not in self.indexes:
+            return pygame.sprite.groupcollide(groupa, groupb, dokilla, dokillb, collided)
+
+        crashed = {}
+        for sprite in groupa.sprites():
+            hits = self.spritecollide(sprite, groupb, dokillb, collided)
+            if hits:
+                crashed[sprite] = hits
+                if dokilla:
+                    sprite.kill()
+        return crashed
+
+
+class TargetIndex:
+    """Grid over the centres of a target group answering nearest-target queries for homing rockets."""
+
+    def __init__(self, group, cell_size=CELL_SIZE * 2):
+        self.group = group
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}
+        self.bounds = None  # (min cell x, min cell y, max cell x, max cell y)
+        self.stale = True
+
+    def invalidate(self):
+        # Called once per step; the grid is rebuilt on the first query after it
+        self.stale = True
+
+    def rebuild(self):
+        size = self.cell_size
+        self.cells.clear()
+        self.order.clear()
+        min_x = min_y = max_x = max_y = None
+        for i, sprite in enumerate(self.group):
+            cx, cy = sprite.rect.center
+            key = (cx // size, cy // size)
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = [sprite]
+            else:
+                bucket.append(sprite)
+            self.order[sprite] = i
+            if min_x is None:
+                min_x, min_y, max_x, max_y = key[0], key[1], key[0], key[1]
+            else:
+                min_x, max_x = min(min_x, key[0]), max(max_x, key[0])
+                min_y, max_y = min(min_y, key[1]), max(max_y, key[1])
+        self.bounds = None if min_x is None else (min_x, min_y, max_x, max_y)
+        self.stale = False
+
+    def ring(self, qx, qy, r):
+        if r == 0:
+            yield (qx, qy)
+            return
+        for dx in range(-r, r + 1):
+            yield (qx + dx, qy - r)
+            yield (qx + dx, qy + r)
+        for dy in range(-r + 1, r):
+            yield (qx - r, qy + dy)
+            yield (qx + r, qy + dy)
+
+    def nearest(self, x, y):
+        """Closest live target to (x, y) by centre distance; ties go to the earliest in the group."""
+        if self.stale:
+            self.rebuild()
+        if self.bounds is None:
+            return None
+
+        size = self.cell_size
+        qx, qy = x // size, y // size
+        min_x, min_y, max_x, max_y = self.bounds
+        max_ring = max(qx - min_x, max_x - qx, qy - min_y, max_y - qy)
+
+        group = self.group
+        best = None
+        best_distance = float('inf')
+        best_order = 0
+        for r in range(max_ring + 1):
+            # Everything in ring r or beyond is more than (r - 1) cells away
+            if best is not None and best_distance <= (r - 1) * size:
+                break
+            for key in self.ring(qx, qy, r):
+                bucket = self.cells.get(key)
+                if not bucket:
+                    continue
+                for sprite in bucket:
+                    if sprite not in group.spritedict:
+                        continue  # Killed since the grid was built
+                    distance = math.hypot(x - sprite.rect.centerx, y - sprite.rect.centery)
+                    order = self.order[sprite]
+                    if distance < best_distance or (distance == best_distance and order < best_order):
+                        best = sprite
+                        best_distance = distance
+                        best_order = order
+        return best
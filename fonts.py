@@ -0,0 +1,52 @@
+# fonts.py
+# Process-wide font and text caches. Fonts are opened once per (face, size)
+# and rendered labels are kept per (text, size, colour), so menus that draw
+# the same buttons every frame never load a font or rasterize text twice.
+# Cached label surfaces are shared: callers must never draw on them.
+import pygame
+
+WHITE = (255, 255, 255)
+
+
+class FontRegistry:
+    def __init__(self):
+        self.fonts = {}  # (face, size) -> Font; face None is pygame's default font
+        self.labels = {}  # (text, size, colour, face) -> rendered Surface
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, face=None):
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[key] = pygame.font.Font(face, size)
+        return font
+
+    def label(self, text, size, color=WHITE, face=None):
+        key = (text, size, tuple(color), face)
+        surface = self.labels.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.labels[key] = self.font(size, face).render(text, True, color)
+        return surface
+
+    def clear(self):
+        self.labels.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'fonts': len(self.fonts),
+            'labels': len(self.labels),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every menu and HUD
+fonts = FontRegistry()
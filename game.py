@@ -5,400 +5,471 @@ from game_classes import (
     Player,
     Enemy,
     Boss,
-    Explosion,
-    Star,
     PowerUp,
     Asteroid,
+    explosion_pool,
+    rocket_trails,
     set_game_speed_multiplier,
 )
-from game_assets import load_assets
-from menu import main_menu
+from game_assets import assets
+from loading_screen import loading_screen
+from collision import Broadphase, TargetIndex, collide_mask, collision_stats
+from projectiles import Projectiles, PLAYER, ENEMY
+from starfield import parallax_starfield
+from render import Renderer
+from fonts import fonts
+from hud import Hud
+from sim_clock import sim_clock
+from profiler import profiler
+from hitch import hitches
 from settings import WIDTH, HEIGHT  # Import screen dimensions from settings
 from pause_menu import PauseMenu
 
-pygame.init()
-pygame.mixer.init()
-
-# Initialize screen
-if 'screen' not in globals():
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Space Shooter")
-
-hover_sound = pygame.mixer.Sound('assets/sounds/hover.wav')  # Add your hover sound file
-click_sound = pygame.mixer.Sound('assets/sounds/click.wav')  # Add your click sound file
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 
-assets = load_assets()
-
-# Fonts
-game_font = pygame.font.Font(None, 36)  # Default font
-game_over_font = pygame.font.Font(None, 72)
-
-def game_loop(cooperative=False):
-    global score
-    score = 0
-    level = 1
-    next_boss_score = 100  # Score needed to spawn the next boss
-    boss_spawned = False  # Flag to check if boss has been spawned
-    paused = False
-
-    game_speed_multiplier = 1.0
-    slow_motion_end_time = None
-
-    all_sprites = pygame.sprite.Group()
-    bullets = pygame.sprite.Group()
-    rockets = pygame.sprite.Group()
-    enemy_bullets = pygame.sprite.Group()
-    enemies = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    powerups = pygame.sprite.Group()
-
-    # Create multiple layers of stars for parallax effect
-    star_layers = []
-    for i in range(3):
-        star_layer = [
-            Star(
-                random.randint(0, WIDTH),
-                random.randint(0, HEIGHT),
-                random.uniform(0.1 * (i + 1), 1.1 * (i + 1)),
-                random.randint(1, 2),
-                random.randint(30, 100),
-            )
-            for _ in range(50)
-        ]
-        star_layers.append(star_layer)
-
-    # Combine enemies and asteroids for rockets to target
-    combined_targets = pygame.sprite.Group()
-
-    # Define controls for both players
-    player1_controls = {
-        'up': pygame.K_w,
-        'down': pygame.K_s,
-        'left': pygame.K_a,
-        'right': pygame.K_d,
-        'rocket': pygame.K_SPACE,
-        'speed': pygame.K_LSHIFT,
-    }
-
-    player2_controls = {
-        'up': pygame.K_UP,
-        'down': pygame.K_DOWN,
-        'left': pygame.K_LEFT,
-        'right': pygame.K_RIGHT,
-        'rocket': pygame.K_RETURN,
-        'speed': pygame.K_KP0,  # Numpad 0
-    }
-
-    player1 = Player(
-        assets['player1_img'],
-        assets['player1_thruster_frames'],
-        bullets,
-        rockets,
-        all_sprites,
-        combined_targets,
-        assets,
-        player1_controls,
-    )
-    player1.rect.centerx = 100
-    player1.rect.centery = HEIGHT // 2
-
-    all_sprites.add(player1)
-
-    if cooperative:
-        player2 = Player(
-            assets['player2_img'],
-            assets['player2_thruster_frames'],
-            bullets,
-            rockets,
-            all_sprites,
-            combined_targets,
+ADDENEMY = pygame.USEREVENT + 1
+ADDPOWERUP = pygame.USEREVENT + 2
+ADDASTEROID = pygame.USEREVENT + 3
+
+FADE_STEP_MS = 30  # The game over fade darkens by 5 alpha every 30 ms, up to 128
+
+
+class GameScene:
+    """Survival, alone or cooperative: play until every player is dead, then fade to the game over screen."""
+
+    def __init__(self, cooperative=False, headless=False, render=True):
+        # headless: one fixed step per frame and nothing sent to the display; render: draw frames at all
+        self.cooperative = cooperative
+        self.headless = headless
+        self.render = render
+
+    def enter(self):
+        screen = self.screen = pygame.display.get_surface()
+        # Load whatever the menu didn't preload now, not mid-game at first use
+        loading = assets.preload('survival', background=True)
+        if self.headless:
+            loading.wait()
+        else:
+            loading_screen(screen, loading)
+        self.click_sound = assets['click_sound']
+        sim_clock.reset()  # Every entity timer below starts from simulation time 0
+        rocket_trails.clear()
+        self.phase = 'playing'  # Then 'fading' once every player is dead, then 'game_over'
+        self.score = 0
+        self.level = 1
+        self.next_boss_score = 100  # Score needed to spawn the next boss
+        self.boss_spawned = False  # Flag to check if boss has been spawned
+
+        self.game_speed_multiplier = 1.0
+        self.slow_motion_end_time = None
+
+        self.all_sprites = pygame.sprite.Group()
+        self.rockets = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+
+        # Bullets live in NumPy arrays rather than sprite groups; the ships fire through per-owner views
+        self.projectiles = Projectiles()
+        self.bullets = self.projectiles.group(PLAYER)
+        self.enemy_bullets = self.projectiles.group(ENEMY)
+
+        # Create multiple layers of stars for parallax effect
+        self.stars = parallax_starfield()
+
+        # Combine enemies and asteroids for rockets to target
+        self.combined_targets = pygame.sprite.Group()
+
+        # Nearest-target grid shared by every homing rocket
+        self.target_index = TargetIndex(self.combined_targets)
+
+        # Spatial hash shared by all the collision passes below
+        self.broadphase = Broadphase()
+
+        # Define controls for both players
+        player1_controls = {
+            'up': pygame.K_w,
+            'down': pygame.K_s,
+            'left': pygame.K_a,
+            'right': pygame.K_d,
+            'rocket': pygame.K_SPACE,
+            'speed': pygame.K_LSHIFT,
+        }
+
+        player2_controls = {
+            'up': pygame.K_UP,
+            'down': pygame.K_DOWN,
+            'left': pygame.K_LEFT,
+            'right': pygame.K_RIGHT,
+            'rocket': pygame.K_RETURN,
+            'speed': pygame.K_KP0,  # Numpad 0
+        }
+
+        self.player1 = Player(
+            assets['player1_img'],
+            assets['player1_thruster_frames'],
+            self.bullets,
+            self.rockets,
+            self.all_sprites,
+            self.combined_targets,
             assets,
-            player2_controls,
+            player1_controls,
+            target_index=self.target_index,
+            ship_frames=assets['player1_frames'],
         )
-        player2.rect.centerx = 100
-        player2.rect.centery = HEIGHT // 3
-
-        all_sprites.add(player2)
-    else:
-        player2 = None  # No player 2 in single-player mode
-
-    ADDENEMY = pygame.USEREVENT + 1
-    ADDPOWERUP = pygame.USEREVENT + 2
-    ADDASTEROID = pygame.USEREVENT + 3
-
-    enemy_spawn_interval = 2000  # Initial spawn interval for enemies
-    asteroid_spawn_interval = 5000  # Initial spawn interval for asteroids
-
-    pygame.time.set_timer(ADDENEMY, enemy_spawn_interval)
-    pygame.time.set_timer(ADDPOWERUP, 1000)  # Spawn power-up every 10 seconds
-    pygame.time.set_timer(ADDASTEROID, asteroid_spawn_interval)
-
-    # Background image
-    background = assets['game_background']
-    background_x = 0  # For parallax effect
-
-    running = True
-    while running:
-        pygame.time.Clock().tick(60)
+        self.player1.rect.centerx = 100
+        self.player1.rect.centery = HEIGHT // 2
+
+        self.all_sprites.add(self.player1)
+
+        if self.cooperative:
+            self.player2 = Player(
+                assets['player2_img'],
+                assets['player2_thruster_frames'],
+                self.bullets,
+                self.rockets,
+                self.all_sprites,
+                self.combined_targets,
+                assets,
+                player2_controls,
+                target_index=self.target_index,
+                ship_frames=assets['player2_frames'],
+            )
+            self.player2.rect.centerx = 100
+            self.player2.rect.centery = HEIGHT // 3
+
+            self.all_sprites.add(self.player2)
+        else:
+            self.player2 = None  # No player 2 in single-player mode
+
+        self.enemy_spawn_interval = 2000  # Initial spawn interval for enemies
+        self.asteroid_spawn_interval = 5000  # Initial spawn interval for asteroids
+
+        # Spawn timers run on the simulation clock so they pause and fast-forward with the game
+        sim_clock.set_timer(ADDENEMY, self.enemy_spawn_interval)
+        sim_clock.set_timer(ADDPOWERUP, 1000)  # Spawn power-up every 10 seconds
+        sim_clock.set_timer(ADDASTEROID, self.asteroid_spawn_interval)
+
+        # Background image
+        self.background_x = 0  # For parallax effect
+        self.renderer = Renderer(screen, assets['game_background'], headless=self.headless)
+
+        # Score, level and rocket counters are rendered again only when they change
+        game_font = fonts.font(36)  # Default font
+        self.hud = Hud()
+        self.hud.add('score', game_font, "Score: {}", self.score, topleft=(10, 10))
+        self.hud.add('level', game_font, "Level: {}", self.level, topleft=(WIDTH - 150, 10))
+        self.hud.add('rockets1', game_font, "P1 Rockets: {}", self.player1.rocket_count, topleft=(10, 50))
+        if self.cooperative and self.player2:
+            self.hud.add('rockets2', game_font, "P2 Rockets: {}", self.player2.rocket_count, topleft=(10, 90))
+        self.hud.add('paused', game_font, "PAUSED", color=RED, visible=False, midtop=(WIDTH // 2, HEIGHT // 2))
+
+        self.paused_frame_shown = False
+        self.fade_ms = 0  # Time spent fading out to the game over screen
+
+        # Game Over screen with buttons and hover effects
+        self.game_over_text = fonts.label("GAME OVER", 72, RED)
+        self.buttons = [
+            {
+                "rect": pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 50, 200, 50),
+                "color": (70, 70, 70),
+                "hover_color": (0, 255, 0),
+                "text": "RETRY"
+            },
+            {
+                "rect": pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 120, 200, 50),
+                "color": (70, 70, 70),
+                "hover_color": (255, 0, 0),
+                "text": "MAIN MENU"
+            },
+        ]
+        self.current_index = 0  # Initially, select the Retry button
+
+    def exit(self):
+        # Kill every sprite so pooled explosions go back to their pool and no group keeps the round alive
+        for group in (self.all_sprites, self.rockets, self.enemies, self.asteroids, self.powerups, self.combined_targets):
+            for sprite in group.sprites():
+                sprite.kill()
+        rocket_trails.clear()
+        sim_clock.reset()  # Drop this round's spawn timers
+
+    def entity_counts(self):
+        # Per-group sizes for the profiler
+        return {
+            'sprites': len(self.all_sprites),
+            'enemies': len(self.enemies),
+            'asteroids': len(self.asteroids),
+            'rockets': len(self.rockets),
+            'powerups': len(self.powerups),
+            'bullets': len(self.projectiles),
+            'trails': len(rocket_trails),
+        }
+
+    def update_hud(self):
+        self.hud.set('score', self.score)
+        self.hud.set('level', self.level)
+        self.hud.set('rockets1', self.player1.rocket_count)
+        if self.cooperative and self.player2:
+            self.hud.set('rockets2', self.player2.rocket_count)
+
+    def update(self, events, elapsed_ms=None):
+        """Advance one frame; returns the name of the scene to switch to, or None to stay."""
+        if self.phase == 'playing':
+            return self.update_playing(events, elapsed_ms)
+        if self.phase == 'fading':
+            self.fade_ms += elapsed_ms
+            if self.fade_ms >= 128 // 5 * FADE_STEP_MS:
+                self.phase = 'game_over'
+                self.renderer.invalidate()  # First frame paints the whole screen; after that only the buttons change
+            return None
+        return self.update_game_over(events)
+
+    def update_playing(self, events, elapsed_ms):
+        if self.headless:
+            steps = 1  # One fixed step per frame, as fast as the CPU allows
+        else:
+            # Run as many fixed steps as real time demands, catching up after a slow frame
+            steps = sim_clock.steps_for(elapsed_ms)
 
         # Event handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == ADDENEMY and not paused:
-                # Determine if the enemy should move randomly
-                move_randomly_chance = min(10 + (level - 1) * 5, 100)  # Increase chance as level increases
-                move_randomly = random.randint(1, 100) <= move_randomly_chance
-                enemy = Enemy(
-                    assets['enemy_img'],
-                    enemy_bullets,
-                    all_sprites,
-                    assets,
-                    move_randomly,
-                    level,
-                )
-                all_sprites.add(enemy)
-                enemies.add(enemy)
-                combined_targets.add(enemy)
-            if event.type == ADDPOWERUP and not paused:
-                powerup_type = random.choice(['shooting', 'slow_motion', 'kill_all', 'rocket', 'spread', ])
-                if powerup_type == 'shooting':
-                    powerup_image = assets['powerup_img']
-                elif powerup_type == 'slow_motion':
-                    powerup_image = assets['slow_motion_powerup_img']
-                elif powerup_type == 'kill_all':
-                    powerup_image = assets['kill_all_powerup_img']
-                elif powerup_type == 'rocket':
-                    powerup_image = assets['rocket_powerup_img']   
-                elif powerup_type == 'spread':  # Add new power-up
-                    powerup_image = assets['spread_powerup_img']  # Add this to your assets
-                
-                powerup = PowerUp(powerup_image, powerup_type)
-                all_sprites.add(powerup)
-                powerups.add(powerup)
-                
-            if event.type == ADDASTEROID and not paused:
-                asteroid = Asteroid(assets['asteroid_img'], 'large')
-                all_sprites.add(asteroid)
-                asteroids.add(asteroid)
-                combined_targets.add(asteroid)
+        for event in events:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:
-                    paused = not paused
-                    for sprite in all_sprites:
-                        if hasattr(sprite, 'pause'):
-                            sprite.pause()
+                    sim_clock.toggle_pause()  # A paused clock runs no steps
                 elif event.key == pygame.K_ESCAPE:
-                    click_sound.play() 
-                    main_menu()
-                    return  # Exit the game_loop function
+                    self.click_sound.play()
+                    return 'menu'
+        profiler.mark('events')
+
+        all_sprites = self.all_sprites
+        enemies = self.enemies
+        asteroids = self.asteroids
+        combined_targets = self.combined_targets
+        broadphase = self.broadphase
+        bullets = self.bullets
+        player1, player2 = self.player1, self.player2
+        for _ in range(steps):
+            for timer_event in sim_clock.tick():
+                if timer_event == ADDENEMY:
+                    # Determine if the enemy should move randomly
+                    move_randomly_chance = min(10 + (self.level - 1) * 5, 100)  # Increase chance as level increases
+                    move_randomly = random.randint(1, 100) <= move_randomly_chance
+                    enemy = Enemy(
+                        assets['enemy_img'],
+                        self.enemy_bullets,
+                        all_sprites,
+                        assets,
+                        move_randomly,
+                        self.level,
+                    )
+                    all_sprites.add(enemy)
+                    enemies.add(enemy)
+                    combined_targets.add(enemy)
+                    hitches.event('spawn', 'enemy')
+                if timer_event == ADDPOWERUP:
+                    powerup_type = random.choice(['shooting', 'slow_motion', 'kill_all', 'rocket', 'spread', ])
+                    if powerup_type == 'shooting':
+                        powerup_image = assets['powerup_img']
+                    elif powerup_type == 'slow_motion':
+                        powerup_image = assets['slow_motion_powerup_img']
+                    elif powerup_type == 'kill_all':
+                        powerup_image = assets['kill_all_powerup_img']
+                    elif powerup_type == 'rocket':
+                        powerup_image = assets['rocket_powerup_img']
+                    elif powerup_type == 'spread':  # Add new power-up
+                        powerup_image = assets['spread_powerup_img']  # Add this to your assets
+
+                    powerup = PowerUp(powerup_image, powerup_type)
+                    all_sprites.add(powerup)
+                    self.powerups.add(powerup)
+                    hitches.event('spawn', 'powerup')
+
+                if timer_event == ADDASTEROID:
+                    asteroid = Asteroid(assets['asteroid_img'], 'large')
+                    all_sprites.add(asteroid)
+                    asteroids.add(asteroid)
+                    combined_targets.add(asteroid)
+                    hitches.event('spawn', 'asteroid')
 
-        if not paused:
             # Update background position for parallax effect
-            background_x -= 0.1 * game_speed_multiplier  # Adjust speed as needed
-            if background_x <= -WIDTH:
-                background_x = 0
+            self.background_x -= 0.1 * self.game_speed_multiplier  # Adjust speed as needed
+            if self.background_x <= -WIDTH:
+                self.background_x = 0
 
             # Spawn boss when score reaches next_boss_score and only if boss hasn't spawned yet
-            if score >= next_boss_score and not boss_spawned:
-                boss = Boss(assets['boss_img'], enemy_bullets, all_sprites, assets, level)
+            if self.score >= self.next_boss_score and not self.boss_spawned:
+                boss = Boss(assets['boss_img'], self.enemy_bullets, all_sprites, assets, self.level)
                 all_sprites.add(boss)
                 enemies.add(boss)
                 combined_targets.add(boss)
-                boss_spawned = True
+                self.boss_spawned = True
+                hitches.event('spawn', 'boss')
                 # Add rockets when level increases
                 player1.add_rockets(3)
-                if cooperative and player2:
+                if self.cooperative and player2:
                     player2.add_rockets(3)
 
+            self.target_index.invalidate()  # Targets move this step; rebuild on the first rocket query
+            rocket_trails.update()  # Before the rockets emit, so new particles first move next step
+            self.projectiles.update(self.game_speed_multiplier)  # Before the ships fire, so new bullets first move next step
             all_sprites.update()
+            profiler.mark('update')
+
+            # Index everything that moved once, then let every collision pass query the grid
+            broadphase.rebuild(self.rockets, enemies, asteroids, self.powerups)
+            profiler.mark('collisions')
 
             # Update stars
-            for layer in star_layers:
-                for star in layer:
-                    star.update()
+            self.stars.update()
+            profiler.mark('stars')
 
             # Handle collisions between player bullets and enemies
-            hits = pygame.sprite.groupcollide(enemies, bullets, False, True)
+            hits = bullets.collide_group(enemies)
             for enemy_hit in hits:
                 if isinstance(enemy_hit, Boss):
                     enemy_hit.take_damage(1)  # Each bullet does 1 damage
                     if enemy_hit.health <= 0:
-                        explosion = Explosion(
-                            enemy_hit.rect.center, assets['explosion_spritesheet']
-                        )
-                        all_sprites.add(explosion)
-                        assets['explosion_sound'].play()
-                        enemies.remove(enemy_hit)
-                        all_sprites.remove(enemy_hit)
-                        combined_targets.remove(enemy_hit)
-                        score += 50  # Boss gives more points
-                        boss_spawned = False
-                        level += 1  # Increase level
-                        # Update next boss score
-                        next_boss_score += level * 100  # Increase score needed for next boss
-                        # Increase difficulty
-                        enemy_spawn_interval = max(500, enemy_spawn_interval - 200)
-                        asteroid_spawn_interval = max(2000, asteroid_spawn_interval - 500)
-                        pygame.time.set_timer(ADDENEMY, enemy_spawn_interval)
-                        pygame.time.set_timer(ADDASTEROID, asteroid_spawn_interval)
-                        # Add rockets for next level
-                        player1.add_rockets(3)
-                        if cooperative and player2:
-                            player2.add_rockets(3)
+                        self.boss_defeated(enemy_hit)
                 else:
                     enemy_hit.kill()
-                    explosion = Explosion(
-                        enemy_hit.rect.center, assets['explosion_spritesheet']
+                    explosion = explosion_pool.acquire(
+                        enemy_hit.rect.center, assets['explosion_frames']['normal']
                     )
                     all_sprites.add(explosion)
                     assets['explosion_sound'].play()
-                    score += 10
+                    self.score += 10
                     combined_targets.remove(enemy_hit)
+                    hitches.event('kill', 'enemy')
 
             # Handle collisions between rockets and enemies
-            hits = pygame.sprite.groupcollide(enemies, rockets, False, True)
+            hits = broadphase.groupcollide(enemies, self.rockets, False, True)
             for enemy_hit in hits:
                 if isinstance(enemy_hit, Boss):
                     enemy_hit.take_damage(4)  # Rockets do 4 damage
                     if enemy_hit.health <= 0:
-                        explosion = Explosion(
-                            enemy_hit.rect.center, assets['explosion_spritesheet']
-                        )
-                        all_sprites.add(explosion)
-                        assets['explosion_sound'].play()
-                        enemies.remove(enemy_hit)
-                        all_sprites.remove(enemy_hit)
-                        combined_targets.remove(enemy_hit)
-                        score += 50  # Boss gives more points
-                        boss_spawned = False
-                        level += 1  # Increase level
-                        # Update next boss score
-                        next_boss_score += level * 100  # Increase score needed for next boss
-                        # Increase difficulty
-                        enemy_spawn_interval = max(500, enemy_spawn_interval - 200)
-                        asteroid_spawn_interval = max(2000, asteroid_spawn_interval - 500)
-                        pygame.time.set_timer(ADDENEMY, enemy_spawn_interval)
-                        pygame.time.set_timer(ADDASTEROID, asteroid_spawn_interval)
-                        # Add rockets for next level
-                        player1.add_rockets(3)
-                        if cooperative and player2:
-                            player2.add_rockets(3)
+                        self.boss_defeated(enemy_hit)
                 else:
                     enemy_hit.kill()
-                    explosion = Explosion(
-                        enemy_hit.rect.center, assets['explosion_spritesheet']
+                    explosion = explosion_pool.acquire(
+                        enemy_hit.rect.center, assets['explosion_frames']['normal']
                     )
                     all_sprites.add(explosion)
                     assets['explosion_sound'].play()
-                    score += 20  # Rockets give more points
+                    self.score += 20  # Rockets give more points
                     combined_targets.remove(enemy_hit)
+                    hitches.event('kill', 'enemy')
 
             # Handle collisions between player bullets and asteroids
-            hits = pygame.sprite.groupcollide(asteroids, bullets, True, True)
+            hits = bullets.collide_group(asteroids, dokill=True)
             for asteroid_hit in hits:
-                explosion = Explosion(
-                    asteroid_hit.rect.center, assets['explosion_spritesheet']
+                explosion = explosion_pool.acquire(
+                    asteroid_hit.rect.center, assets['explosion_frames']['normal']
                 )
                 all_sprites.add(explosion)
                 assets['explosion_sound'].play()
-                score += 5
+                self.score += 5
                 # Break asteroid into smaller pieces
                 pieces = asteroid_hit.break_apart()
                 for piece in pieces:
                     all_sprites.add(piece)
                     asteroids.add(piece)
+                    broadphase.add(asteroids, piece)
                     combined_targets.add(piece)
                 combined_targets.remove(asteroid_hit)
+                hitches.event('kill', 'asteroid')
 
             # Handle collisions between rockets and asteroids
-            hits = pygame.sprite.groupcollide(asteroids, rockets, True, True)
+            hits = broadphase.groupcollide(asteroids, self.rockets, True, True)
             for asteroid_hit in hits:
-                explosion = Explosion(
-                    asteroid_hit.rect.center, assets['explosion_spritesheet']
+                explosion = explosion_pool.acquire(
+                    asteroid_hit.rect.center, assets['explosion_frames']['normal']
                 )
                 all_sprites.add(explosion)
                 assets['explosion_sound'].play()
-                score += 10
+                self.score += 10
                 # Do not break asteroid into smaller pieces
                 combined_targets.remove(asteroid_hit)
+                hitches.event('kill', 'asteroid')
 
             # Handle collisions between asteroids and enemies
-            hits = pygame.sprite.groupcollide(enemies, asteroids, False, False)
+            hits = broadphase.groupcollide(enemies, asteroids, False, False)
             for enemy_hit, asteroid_hits in hits.items():
                 for asteroid_hit in asteroid_hits:
                     if not isinstance(enemy_hit, Boss):
                         enemy_hit.kill()
-                        explosion = Explosion(
-                            enemy_hit.rect.center, assets['explosion_spritesheet']
+                        explosion = explosion_pool.acquire(
+                            enemy_hit.rect.center, assets['explosion_frames']['normal']
                         )
                         all_sprites.add(explosion)
                         assets['explosion_sound'].play()
-                        score += 10
+                        self.score += 10
                         combined_targets.remove(enemy_hit)
+                        hitches.event('kill', 'enemy')
 
             # Handle collisions between players and enemy bullets
             for player in [player1, player2]:
                 if player and player.alive:
-                    hits = pygame.sprite.spritecollide(player, enemy_bullets, True, pygame.sprite.collide_mask)
+                    hits = self.enemy_bullets.collide_mask(player)
                     if hits:
-                        explosion = Explosion(player.rect.center, assets['explosion_spritesheet'])
+                        explosion = explosion_pool.acquire(player.rect.center, assets['explosion_frames']['normal'])
                         all_sprites.add(explosion)
                         assets['explosion_sound'].play()
                         player.alive = False
                         all_sprites.remove(player)
+                        hitches.event('death', 'player')
 
             # Handle collisions between players and enemies
             for player in [player1, player2]:
                 if player and player.alive:
-                    hits = pygame.sprite.spritecollide(player, enemies, True, pygame.sprite.collide_mask)
+                    hits = broadphase.spritecollide(player, enemies, True, collide_mask)
                     if hits:
-                        explosion = Explosion(player.rect.center, assets['explosion_spritesheet'])
+                        explosion = explosion_pool.acquire(player.rect.center, assets['explosion_frames']['normal'])
                         all_sprites.add(explosion)
                         assets['explosion_sound'].play()
                         player.alive = False
                         all_sprites.remove(player)
+                        hitches.event('death', 'player')
 
             # Handle collisions between players and asteroids
             for player in [player1, player2]:
                 if player and player.alive:
-                    hits = pygame.sprite.spritecollide(player, asteroids, True, pygame.sprite.collide_mask)
+                    hits = broadphase.spritecollide(player, asteroids, True, collide_mask)
                     if hits:
-                        explosion = Explosion(player.rect.center, assets['explosion_spritesheet'])
+                        explosion = explosion_pool.acquire(player.rect.center, assets['explosion_frames']['normal'])
                         all_sprites.add(explosion)
                         assets['explosion_sound'].play()
                         player.alive = False
                         all_sprites.remove(player)
+                        hitches.event('death', 'player')
 
             # Handle collisions between players and power-ups
             for player in [player1, player2]:
                 if player and player.alive:
-                    hits = pygame.sprite.spritecollide(player, powerups, True)
+                    hits = broadphase.spritecollide(player, self.powerups, True)
                     for hit in hits:
+                        hitches.event('powerup', hit.type)
                         if hit.type == 'shooting':
                             player.power_up()
                             assets['powerup_sound'].play()
                         elif hit.type == 'slow_motion':
-                            game_speed_multiplier = 0.5  # Slow down the game
-                            slow_motion_end_time = pygame.time.get_ticks() + 10000  # 10 seconds duration
-                            set_game_speed_multiplier(game_speed_multiplier)
+                            self.game_speed_multiplier = 0.5  # Slow down the game
+                            self.slow_motion_end_time = sim_clock.get_ticks() + 10000  # 10 seconds duration
+                            set_game_speed_multiplier(self.game_speed_multiplier)
                             assets['powerup_sound'].play()
                         elif hit.type == 'kill_all':
                             # Kill all enemies and asteroids except the boss
                             for enemy in enemies:
                                 if not isinstance(enemy, Boss):
                                     enemy.kill()
-                                    explosion = Explosion(enemy.rect.center, assets['explosion_spritesheet'])
+                                    explosion = explosion_pool.acquire(enemy.rect.center, assets['explosion_frames']['normal'])
                                     all_sprites.add(explosion)
                                     combined_targets.remove(enemy)
                             for asteroid in asteroids:
                                 asteroid.kill()
-                                explosion = Explosion(asteroid.rect.center, assets['explosion_spritesheet'])
+                                explosion = explosion_pool.acquire(asteroid.rect.center, assets['explosion_frames']['normal'])
                                 all_sprites.add(explosion)
                                 combined_targets.remove(asteroid)
                             assets['explosion_sound'].play()
@@ -409,157 +480,198 @@ def game_loop(cooperative=False):
                             player.increase_spread()
                             assets['powerup_sound'].play()
 
+            collision_stats.end_frame()  # Close this step's narrow-phase counters
+            profiler.mark('collisions')
+
             # Check if slow-motion effect has ended
-            if slow_motion_end_time and pygame.time.get_ticks() > slow_motion_end_time:
-                game_speed_multiplier = 1.0
-                set_game_speed_multiplier(game_speed_multiplier)
-                slow_motion_end_time = None
+            if self.slow_motion_end_time and sim_clock.get_ticks() > self.slow_motion_end_time:
+                self.game_speed_multiplier = 1.0
+                set_game_speed_multiplier(self.game_speed_multiplier)
+                self.slow_motion_end_time = None
 
             # Check if all players are dead
-            if not player1.alive and (not cooperative or (cooperative and player2 and not player2.alive)):
-                running = False  # End the game
+            if not player1.alive and (not self.cooperative or (self.cooperative and player2 and not player2.alive)):
+                self.phase = 'fading'  # End the game; this frame is still drawn, then the screen fades out
+                break
+        return None
+
+    def boss_defeated(self, boss):
+        explosion = explosion_pool.acquire(
+            boss.rect.center, assets['explosion_frames']['large']
+        )
+        self.all_sprites.add(explosion)
+        assets['explosion_sound'].play()
+        self.enemies.remove(boss)
+        self.all_sprites.remove(boss)
+        self.combined_targets.remove(boss)
+        self.score += 50  # Boss gives more points
+        hitches.event('kill', 'boss')
+        self.boss_spawned = False
+        self.level += 1  # Increase level
+        # Update next boss score
+        self.next_boss_score += self.level * 100  # Increase score needed for next boss
+        # Increase difficulty
+        self.enemy_spawn_interval = max(500, self.enemy_spawn_interval - 200)
+        self.asteroid_spawn_interval = max(2000, self.asteroid_spawn_interval - 500)
+        sim_clock.set_timer(ADDENEMY, self.enemy_spawn_interval)
+        sim_clock.set_timer(ADDASTEROID, self.asteroid_spawn_interval)
+        # Add rockets for next level
+        self.player1.add_rockets(3)
+        if self.cooperative and self.player2:
+            self.player2.add_rockets(3)
+
+    def update_game_over(self, events):
+        mouse_pos = pygame.mouse.get_pos()
+        buttons = self.buttons
 
-        # Draw everything
-        screen.fill(BLACK)
+        # Update selected button based on keyboard navigation (Up/Down or W/S)
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            self.current_index = (self.current_index + 1) % len(buttons)
+            pygame.time.wait(150)  # Avoid fast cycling
+        elif keys[pygame.K_UP] or keys[pygame.K_w]:
+            self.current_index = (self.current_index - 1) % len(buttons)
+            pygame.time.wait(150)
 
-        # Draw the game background with parallax effect
-        screen.blit(background, (background_x, 0))
-        screen.blit(background, (background_x + WIDTH, 0))
+        # Mouse hover selects a button too
+        for i, button in enumerate(buttons):
+            if button["rect"].collidepoint(mouse_pos):
+                self.current_index = i
+
+        retry = 'cooperative' if self.cooperative else 'single'  # A fresh round of the same mode
+
+        # Handle mouse click and Enter key selection
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN:
+                    # Check the current selected button
+                    if self.current_index == 0:  # Retry button
+                        self.click_sound.play()
+                        return retry
+                    elif self.current_index == 1:  # Main Menu button
+                        self.click_sound.play()  # Play sound when going back to the main menu
+                        return 'menu'
+
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if buttons[0]["rect"].collidepoint(mouse_pos):
+                    self.click_sound.play()
+                    return retry
+                elif buttons[1]["rect"].collidepoint(mouse_pos):
+                    self.click_sound.play()  # Play click sound
+                    return 'menu'
+        return None
+
+    def draw(self):
+        if not self.render:
+            return
+        if self.phase == 'playing':
+            self.draw_playing()
+        elif self.phase == 'fading':
+            self.draw_fading()
+        else:
+            self.draw_game_over()
+
+    def draw_playing(self):
+        screen = self.screen
+        renderer = self.renderer
+        if sim_clock.paused and self.paused_frame_shown:
+            return  # Nothing moves while paused and the paused frame is already on screen
+
+        # Draw everything: background, then only what moved when rendering dirty rects
+        renderer.begin(self.background_x)
 
         # Draw star layers for parallax effect
-        for layer in star_layers:
-            for star in layer:
-                star.draw(screen)
-
-        all_sprites.draw(screen)
-
-        score_text = game_font.render(f"Score: {score}", True, WHITE)
-        level_text = game_font.render(f"Level: {level}", True, WHITE)
-        rockets_text1 = game_font.render(f"P1 Rockets: {player1.rocket_count}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        screen.blit(level_text, (WIDTH - 150, 10))
-        screen.blit(rockets_text1, (10, 50))
-
-        if cooperative and player2:
-            rockets_text2 = game_font.render(f"P2 Rockets: {player2.rocket_count}", True, WHITE)
-            screen.blit(rockets_text2, (10, 90))
-
-        if paused:
-            pause_text = game_font.render("PAUSED", True, RED)
-            screen.blit(pause_text, (WIDTH // 2 - pause_text.get_width() // 2, HEIGHT // 2))
-
-        pygame.display.flip()
-
-    # Game Over transition
-    for alpha in range(0, 128, 5):
-        # Redraw the last frame
-        screen.fill(BLACK)
-        # Draw game background
-        screen.blit(background, (background_x, 0))
-        screen.blit(background, (background_x + WIDTH, 0))
+        renderer.mark(self.stars.draw(screen, renderer.dirty))
+
+        renderer.draw_group(self.all_sprites)
+        renderer.mark(self.projectiles.draw(screen, renderer.dirty))
+        renderer.mark(rocket_trails.draw(screen, renderer.dirty))
+
+        self.update_hud()
+        self.hud.show('paused', sim_clock.paused)
+        renderer.mark(self.hud.draw(screen))
+
+        renderer.present()
+        self.paused_frame_shown = sim_clock.paused
+
+    def draw_fading(self):
+        screen = self.screen
+        # Redraw the last frame, starting with the game background
+        self.renderer.paint_background(self.background_x)
         # Draw star layers
-        for layer in star_layers:
-            for star in layer:
-                star.draw(screen)
-        all_sprites.draw(screen)
+        self.stars.draw(screen)
+        self.all_sprites.draw(screen)
+        self.projectiles.draw(screen)
+        rocket_trails.draw(screen)
         # Draw score and level
-        score_text = game_font.render(f"Score: {score}", True, WHITE)
-        level_text = game_font.render(f"Level: {level}", True, WHITE)
-        rockets_text1 = game_font.render(f"P1 Rockets: {player1.rocket_count}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        screen.blit(level_text, (WIDTH - 150, 10))
-        screen.blit(rockets_text1, (10, 50))
-        if cooperative and player2:
-            rockets_text2 = game_font.render(f"P2 Rockets: {player2.rocket_count}", True, WHITE)
-            screen.blit(rockets_text2, (10, 90))
+        self.update_hud()
+        self.hud.show('paused', False)
+        self.hud.draw(screen)
         # Create a semi-transparent surface to overlay
         dark_surface = pygame.Surface((WIDTH, HEIGHT))
-        dark_surface.set_alpha(alpha)
+        dark_surface.set_alpha(min(128, self.fade_ms // FADE_STEP_MS * 5))
         dark_surface.fill((0, 0, 0))
         screen.blit(dark_surface, (0, 0))
-        pygame.display.flip()
-        pygame.time.delay(30)
-
-    # Game Over screen with buttons and hover effects
-    game_over_text = game_over_font.render("GAME OVER", True, RED)
-
-    retry_button = {
-        "rect": pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 50, 200, 50),
-        "color": (70, 70, 70),
-        "hover_color": (0, 255, 0),
-        "text": "RETRY"
-    }
-
-    main_menu_button = {
-        "rect": pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 120, 200, 50),
-        "color": (70, 70, 70),
-        "hover_color": (255, 0, 0),
-        "text": "MAIN MENU"
-    }
-
-    button_font = pygame.font.Font(None, 48)
-    buttons = [retry_button, main_menu_button]
-    current_index = 0  # Initially, select the Retry button
+        if not self.headless:
+            pygame.display.flip()
 
-    while True:
+    def draw_game_over(self):
+        screen = self.screen
+        renderer = self.renderer
         mouse_pos = pygame.mouse.get_pos()
 
-        screen.fill(BLACK)
-        screen.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 2 - 100))
-
-        # Update selected button based on keyboard navigation (Up/Down or W/S)
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            current_index = (current_index + 1) % len(buttons)
-            pygame.time.wait(150)  # Avoid fast cycling
-        elif keys[pygame.K_UP] or keys[pygame.K_w]:
-            current_index = (current_index - 1) % len(buttons)
-            pygame.time.wait(150)
+        if not renderer.dirty or renderer.full_update:
+            screen.fill(BLACK)
+            screen.blit(self.game_over_text, (WIDTH // 2 - self.game_over_text.get_width() // 2, HEIGHT // 2 - 100))
 
         # Handle hover effect and keyboard selection
-        for i, button in enumerate(buttons):
+        for i, button in enumerate(self.buttons):
             button_rect = button["rect"]
             # Only highlight if either hovered by mouse OR selected via keyboard, not both
-            if button_rect.collidepoint(mouse_pos):
-                current_index = i
+            if button_rect.collidepoint(mouse_pos) or i == self.current_index:
                 button_color = button["hover_color"]
             else:
-                button_color = button["hover_color"] if (i == current_index) else button["color"]
-            
-            pygame.draw.rect(screen, button_color, button_rect)
+                button_color = button["color"]
+
+            renderer.mark(pygame.draw.rect(screen, button_color, button_rect))
 
             # Render the text and center it in the button
-            text_surface = button_font.render(button["text"], True, WHITE)
+            text_surface = fonts.label(button["text"], 48, WHITE)
             text_rect = text_surface.get_rect(center=button_rect.center)
             screen.blit(text_surface, text_rect)
 
-        # Handle mouse click and Enter key selection
-        for event in pygame.event.get():
+        renderer.present()
+
+
+def game_loop(cooperative=False, headless=False, max_frames=None, render=True):
+    """Play one round outside the scene manager, up to the last player's death, and return its frame count.
+
+    headless: skip display.flip and the frame cap; max_frames: stop after this many frames;
+    render: draw the frame even when headless. The final score is left in the module's `score`.
+    """
+    global score
+    scene = GameScene(cooperative, headless=headless, render=render)
+    scene.enter()
+    clock = pygame.time.Clock()
+    frame_count = 0
+    while True:
+        elapsed_ms = None if headless else clock.tick(60)
+        frame_count += 1
+        profiler.begin_frame('survival')
+        hitches.begin_frame()
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    # Check the current selected button
-                    if current_index == 0:  # Retry button
-                        click_sound.play()
-                        game_loop(cooperative=cooperative)  # Restart the game
-                        return  # Exit game_loop and restart the game
-                    elif current_index == 1:  # Main Menu button
-                        click_sound.play()  # Play sound when going back to the main menu
-                        main_menu()  # Go back to the main menu
-                        return  # Ensure game_loop is exited
-
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if buttons[0]["rect"].collidepoint(mouse_pos):
-                    click_sound.play()
-                    game_loop(cooperative=cooperative)  # Restart the game
-                    return  # Ensure game loop is exited
-                elif buttons[1]["rect"].collidepoint(mouse_pos):
-                    click_sound.play()  # Play click sound
-                    main_menu()  # Go back to the main menu
-                    return
-    
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
+        next_scene = scene.update(events, elapsed_ms)
+        scene.draw()
+        profiler.end_frame(scene.entity_counts)
+        hitches.end_frame('survival', scene.entity_counts)
+        if next_scene is not None or scene.phase != 'playing':
+            break
+        if max_frames is not None and frame_count >= max_frames:
+            break
+    score = scene.score
+    scene.exit()
+    return frame_count
@@ -1,49 +1,463 @@
 # game_assets.py
 import pygame
+import numpy as np
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asset_cache import baked_images
+from atlas import Atlas
+from settings import WIDTH, HEIGHT, ASSET_LOAD_THREADS
+from transform_cache import transform_cache, surface_bytes
 
 IMAGE_PATH = 'assets/images/'
 SOUND_PATH = 'assets/sounds/'
 
-def load_image(filename, scale=None):
-    image = pygame.image.load(os.path.join(IMAGE_PATH, filename)).convert_alpha()
+# Explosion frame sizes in pixels: the sheet's own size, and a bigger one for the boss
+EXPLOSION_SIZES = {'normal': 64, 'large': 160}
+
+log = logging.getLogger(__name__)
+
+def finish_image(image, scale=None):
+    # Main-thread half of loading an image: pixel format conversion and scaling
+    image = image.convert_alpha()
     if scale:
         image = pygame.transform.scale(image, scale)
     return image
 
+def optimize_image(image):
+    """The display-format copy of a per-pixel-alpha image that blits fastest and draws the same pixels:
+    convert() when it is fully opaque, a colorkey with RLE when every pixel is fully opaque or fully clear."""
+    alpha = pygame.surfarray.pixels_alpha(image)
+    opaque = alpha == 255
+    if opaque.all():
+        del alpha
+        return image.convert()
+    if (opaque | (alpha == 0)).all():
+        clear = alpha == 0
+        del alpha
+        colorkey = unused_color(image, ~clear)
+        if colorkey is not None:
+            keyed = image.convert()
+            pixels = pygame.surfarray.pixels3d(keyed)
+            pixels[clear] = colorkey
+            del pixels
+            keyed.set_colorkey(colorkey, pygame.RLEACCEL)
+            return keyed
+    return image
+
+def unused_color(image, mask):
+    # An RGB colour no pixel under the mask has, to use as a colorkey
+    rgb = pygame.surfarray.array3d(image)[mask].astype(np.uint32)
+    used = set(((rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]).tolist())
+    for color in (0xFF00FF, 0x00FF00, 0x010203):
+        if color not in used:
+            return (color >> 16, (color >> 8) & 0xFF, color & 0xFF)
+    return None
+
+def fit_background(image, size, color=(0, 0, 0)):
+    """Scale `image` to fit `size` keeping its aspect ratio, flattened onto `color` so it blits as an opaque copy."""
+    width, height = size
+    aspect_ratio = image.get_width() / image.get_height()
+    if width / height > aspect_ratio:
+        # Screen is wider than the background aspect ratio, so fit by height
+        fitted = (int(height * aspect_ratio), height)
+    else:
+        # Screen is taller than the background aspect ratio, so fit by width
+        fitted = (width, int(width / aspect_ratio))
+    scaled = pygame.transform.scale(image, fitted)
+    flat = pygame.Surface(fitted).convert()
+    flat.fill(color)
+    flat.blit(scaled, (0, 0))
+    return flat
+
+def load_image(filename, scale=None):
+    path = os.path.join(IMAGE_PATH, filename)
+    # Straight from the baked cache unless the source art changed since it was baked
+    return baked_images.load(path, scale, lambda: finish_image(pygame.image.load(path), scale))
+
 def load_sound(filename):
     return pygame.mixer.Sound(os.path.join(SOUND_PATH, filename))
 
-def load_assets():
-    assets = {
-        'player1_img': load_image('player1_ship.png', (50, 30)),
-        'player1_thruster_frames': [load_image(f'player1_thruster_{i}.png') for i in range(1, 5)],
-        'player2_img': load_image('player2_ship.png', (50, 30)),
-        'player2_thruster_frames': [load_image(f'player2_thruster_{i}.png') for i in range(1, 5)],
-        'enemy_img': load_image('enemy_ship.png', (50, 30)),
-        'enemy_thruster_frames': [load_image(f'enemy_thruster_{i}.png') for i in range(1, 5)],
-        'boss_img': load_image('boss.png', (150, 150)),
-        'bullet_img': load_image('bullet.png', (10, 5)),
-        'enemy_bullet_img': load_image('enemy_bullet.png', (10, 5)),
-        'powerup_img': load_image('powerup.png', (60, 30)),  # Shooting power-up image
-        'slow_motion_powerup_img': load_image('slow_motion_powerup.png', (60, 30)),  # Slow-motion power-up image
-        'kill_all_powerup_img': load_image('kill_all_powerup.png', (60, 30)),  # Kill-all power-up image
-        'spread_powerup_img': load_image('spread_powerup.png', (60, 30)),  # Spread power-up image
-        'rocket_powerup_img': load_image('rocket_powerup.png', (60, 30)),  # Rocket power-up image
-        'menu_background': load_image('menu_background.png'),
-        'game_background': load_image('game_background.png'),  # Game background image
-        'versus_background': load_image('versus_background.png'),  # Versus mode background
-        'explosion_spritesheet': load_image('explosion_spritesheet.png'),
-        'explosion_sound': load_sound('explosion.wav'),
-        'gun_sound': load_sound('gun.wav'),
-        'powerup_sound': load_sound('powerup.wav'),
-        'rocket_sound': load_sound('rocket.wav'),
-        'asteroid_img': load_image('asteroid.png'),  # Asteroid image
-        'rocket_img': load_image('rocket.png', (20, 10)),  # Rocket image
-        'background_music': 'background_music.mp3',  # Background music file
-        'versus_music': 'versus_music.mp3',  # Versus mode music
-        'player1_kill_sound': load_sound('player1_kill.wav'),
-        'player2_kill_sound': load_sound('player2_kill.wav'),
-        
+def slice_spritesheet(sheet, columns, rows=1):
+    """Cut a spritesheet into its frames, left to right and top to bottom."""
+    frame_width = sheet.get_width() // columns
+    frame_height = sheet.get_height() // rows
+    return [
+        sheet.subsurface(pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height))
+        for row in range(rows)
+        for col in range(columns)
+    ]
+
+def scale_frames(frames, size):
+    return [pygame.transform.smoothscale(frame, size) for frame in frames]
+
+def build_ship_frames(ship_image, thruster_frames, facing_left=False):
+    """Compose the ship with every thruster frame once, so ships only swap image references."""
+    frames = []
+    for thruster_frame in thruster_frames:
+        if facing_left:
+            # Flip the thruster frame horizontally for facing left
+            thruster_frame = pygame.transform.flip(thruster_frame, True, False)
+        total_width = ship_image.get_width() + thruster_frame.get_width()
+        total_height = max(ship_image.get_height(), thruster_frame.get_height())
+        frame = pygame.Surface((total_width, total_height), pygame.SRCALPHA)
+        ship_rect = ship_image.get_rect(centery=total_height // 2)
+        thruster_rect = thruster_frame.get_rect(centery=total_height // 2)
+        if facing_left:
+            ship_rect.left = 0  # Ship on the left
+            thruster_rect.left = ship_image.get_width()  # Thruster to the right of ship
+            frame.blit(ship_image, ship_rect)
+            frame.blit(thruster_frame, thruster_rect)
+        else:
+            thruster_rect.left = 0  # Thruster on the left
+            ship_rect.left = thruster_frame.get_width()  # Ship to the right of thruster
+            frame.blit(thruster_frame, thruster_rect)
+            frame.blit(ship_image, ship_rect)
+        frames.append(frame)
+    return frames
+
+def load_explosion_frames(sheet):
+    # Explosion animation sliced once and shared read-only by every Explosion, pre-scaled per size
+    frames = slice_spritesheet(sheet, 5)
+    return {
+        name: frames if size == frames[0].get_width() else scale_frames(frames, (size, size))
+        for name, size in EXPLOSION_SIZES.items()
     }
+
+# Every asset loads in two halves. decode() does the file reading and PNG/WAV decoding, which release
+# the GIL, so it may run on a worker thread; finish() does what must happen on the main thread
+# (convert_alpha, scaling, composing) and returns the asset. Composites ask the registry for their parts.
+
+class ImageAsset:
+    def __init__(self, filename, scale=None, optimize=False):
+        self.path = os.path.join(IMAGE_PATH, filename)
+        self.scale = scale
+        self.optimize = optimize  # Store opaque or on/off-alpha images without per-pixel alpha (see optimize_image)
+
+    def decode(self):
+        if not baked_images.enabled:
+            return None, None, pygame.image.load(self.path)
+        key, source_hash, entry = baked_images.lookup(self.path, self.scale)
+        if entry is not None:
+            return key, entry, None  # Baked: nothing to decode
+        return key, source_hash, pygame.image.load(self.path)
+
+    def finish(self, decoded, assets):
+        key, entry, image = decoded
+        if image is None:
+            image = baked_images.wrap(*entry[1:])
+        else:
+            image = finish_image(image, self.scale)
+            if key is not None:
+                baked_images.add(key, entry, image)  # entry is the source hash here
+        return optimize_image(image) if self.optimize else image
+
+
+class ImageListAsset:
+    def __init__(self, filenames, scale=None):
+        self.images = [ImageAsset(filename, scale) for filename in filenames]
+
+    def decode(self):
+        return [image.decode() for image in self.images]
+
+    def finish(self, decoded, assets):
+        return [image.finish(part, assets) for image, part in zip(self.images, decoded)]
+
+
+class SoundAsset:
+    def __init__(self, filename):
+        self.path = os.path.join(SOUND_PATH, filename)
+
+    def decode(self):
+        return pygame.mixer.Sound(self.path)
+
+    def finish(self, sound, assets):
+        return sound
+
+
+class BuiltAsset:
+    # Made on the main thread from other assets
+    def __init__(self, build):
+        self.build = build
+
+    def decode(self):
+        return None
+
+    def finish(self, decoded, assets):
+        return self.build(assets)
+
+
+class AtlasAsset:
+    """Small sprites packed into one Atlas: `sources` are loaded, `builds` are composed from them, then all is packed."""
+
+    def __init__(self, sources, builds):
+        self.sources = sources  # Name -> loader of a packed image or image list
+        self.builds = builds  # Name -> function of the finished sources making a composite to pack too
+
+    def decode(self):
+        return {name: loader.decode() for name, loader in self.sources.items()}
+
+    def finish(self, decoded, assets):
+        parts = {name: loader.finish(decoded[name], assets) for name, loader in self.sources.items()}
+        for name, build in self.builds.items():
+            parts[name] = build(parts)
+        return Atlas(parts)
+
+
+class AtlasRegion:
+    # An asset that is a view into an atlas: the atlas loads (and packs) on first use of any of its views
+    def __init__(self, atlas, name):
+        self.atlas = atlas
+        self.name = name
+
+    def decode(self):
+        return None
+
+    def finish(self, decoded, assets):
+        return assets[self.atlas][self.name]
+
+
+class ValueAsset:
+    def __init__(self, value):
+        self.value = value
+
+    def decode(self):
+        return None
+
+    def finish(self, decoded, assets):
+        return self.value
+
+
+# Small sprites with soft edges, packed together into the 'sprites' atlas. Fully opaque and on/off-alpha
+# sprites stay out of it: on their own they blit as plain copies or colorkeyed runs (see optimize_image)
+SPRITE_SOURCES = {
+    'player1_img': ImageAsset('player1_ship.png', (50, 30)),
+    'player1_thruster_frames': ImageListAsset([f'player1_thruster_{i}.png' for i in range(1, 5)]),
+    'player2_img': ImageAsset('player2_ship.png', (50, 30)),
+    'player2_thruster_frames': ImageListAsset([f'player2_thruster_{i}.png' for i in range(1, 5)]),
+    'enemy_img': ImageAsset('enemy_ship.png', (50, 30)),
+    'enemy_thruster_frames': ImageListAsset([f'enemy_thruster_{i}.png' for i in range(1, 5)]),
+    'boss_img': ImageAsset('boss.png', (150, 150)),
+    'asteroid_img': ImageAsset('asteroid.png'),  # Asteroid image
+    'rocket_img': ImageAsset('rocket.png', (20, 10)),  # Rocket image
+    'explosion_spritesheet': ImageAsset('explosion_spritesheet.png'),
+}
+
+# Composites of the small sprites, packed into the atlas with them
+SPRITE_BUILDS = {
+    # Ship + thruster composites per ship type and facing (enemies face left)
+    'player1_frames': lambda parts: build_ship_frames(parts['player1_img'], parts['player1_thruster_frames']),
+    'player2_frames': lambda parts: build_ship_frames(parts['player2_img'], parts['player2_thruster_frames']),
+    'player2_frames_left': lambda parts: build_ship_frames(
+        pygame.transform.flip(parts['player2_img'], True, False), parts['player2_thruster_frames'], facing_left=True
+    ),
+    'enemy_frames': lambda parts: build_ship_frames(parts['enemy_img'], parts['enemy_thruster_frames'], facing_left=True),
+    'explosion_frames': lambda parts: load_explosion_frames(parts['explosion_spritesheet']),
+}
+
+LOADERS = {
+    'sprites': AtlasAsset(SPRITE_SOURCES, SPRITE_BUILDS),
+    **{name: AtlasRegion('sprites', name) for name in (*SPRITE_SOURCES, *SPRITE_BUILDS)},
+    'bullet_img': ImageAsset('bullet.png', (10, 5), optimize=True),
+    'enemy_bullet_img': ImageAsset('enemy_bullet.png', (10, 5), optimize=True),
+    'powerup_img': ImageAsset('powerup.png', (60, 30), optimize=True),  # Shooting power-up image
+    'slow_motion_powerup_img': ImageAsset('slow_motion_powerup.png', (60, 30), optimize=True),  # Slow-motion power-up image
+    'kill_all_powerup_img': ImageAsset('kill_all_powerup.png', (60, 30), optimize=True),  # Kill-all power-up image
+    'spread_powerup_img': ImageAsset('spread_powerup.png', (60, 30), optimize=True),  # Spread power-up image
+    'rocket_powerup_img': ImageAsset('rocket_powerup.png', (60, 30), optimize=True),  # Rocket power-up image
+    'menu_background': ImageAsset('menu_background.png'),
+    # The menu background fitted to the screen over the menu's black, built once
+    'menu_background_scaled': BuiltAsset(lambda assets: fit_background(assets['menu_background'], (WIDTH, HEIGHT))),
+    'game_background': ImageAsset('game_background.png'),  # Game background image
+    'versus_background': ImageAsset('versus_background.png'),  # Versus mode background
+    'explosion_sound': SoundAsset('explosion.wav'),
+    'gun_sound': SoundAsset('gun.wav'),
+    'powerup_sound': SoundAsset('powerup.wav'),
+    'rocket_sound': SoundAsset('rocket.wav'),
+    'background_music': ValueAsset('background_music.mp3'),  # Background music file
+    'versus_music': ValueAsset('versus_music.mp3'),  # Versus mode music
+    'player1_kill_sound': SoundAsset('player1_kill.wav'),
+    'player2_kill_sound': SoundAsset('player2_kill.wav'),
+    'hover_sound': SoundAsset('hover.wav'),  # Menu buttons
+    'click_sound': SoundAsset('click.wav'),
+}
+
+# The assets each mode uses, for preloading and for unloading when leaving it. Parts come before the
+# composites built from them, as preloading finishes assets in this order
+MANIFESTS = {
+    'menu': ['menu_background', 'menu_background_scaled', 'background_music', 'hover_sound', 'click_sound'],
+    'survival': [
+        'sprites', 'player1_img', 'player1_thruster_frames', 'player1_frames',
+        'player2_img', 'player2_thruster_frames', 'player2_frames',
+        'enemy_img', 'enemy_thruster_frames', 'enemy_frames', 'boss_img',
+        'bullet_img', 'enemy_bullet_img', 'rocket_img', 'asteroid_img',
+        'powerup_img', 'slow_motion_powerup_img', 'kill_all_powerup_img', 'spread_powerup_img', 'rocket_powerup_img',
+        'game_background', 'explosion_spritesheet', 'explosion_frames',
+        'explosion_sound', 'gun_sound', 'powerup_sound', 'rocket_sound', 'hover_sound', 'click_sound',
+    ],
+    'versus': [
+        'sprites', 'player1_img', 'player1_thruster_frames', 'player1_frames',
+        'player2_img', 'player2_thruster_frames', 'player2_frames_left',
+        'bullet_img', 'rocket_img', 'versus_background', 'explosion_spritesheet', 'explosion_frames', 'versus_music',
+        'explosion_sound', 'gun_sound', 'rocket_sound', 'player1_kill_sound', 'player2_kill_sound',
+        'hover_sound', 'click_sound',
+    ],
+}
+
+
+class LoadJob:
+    """A mode's assets decoding on the registry's worker threads; poll() finishes them on the main thread."""
+
+    def __init__(self, registry, names):
+        self.registry = registry
+        self.total = len(names)
+        # Start every decode at once; results are finished in manifest order so parts precede composites
+        self.queue = [(name, registry.submit(name)) for name in names if name not in registry.loaded]
+        self.done = self.total - len(self.queue)
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def finished(self):
+        return not self.queue
+
+    def poll(self, budget=None):
+        """Finish decoded assets, in order, for at most `budget` seconds (None: until one isn't decoded yet)."""
+        deadline = None if budget is None else time.perf_counter() + budget
+        while self.queue and self.queue[0][1].done():
+            name, future = self.queue.pop(0)
+            self.registry.finish(name, future.result())
+            self.done += 1
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        if not self.queue:
+            baked_images.save()  # First run: bake what was just decoded so the next start skips it
+        return self.finished
+
+    def cancel(self):
+        # Stop decoding what hasn't started; assets already finished stay loaded
+        for name, future in self.queue:
+            future.cancel()
+        self.queue = []
+
+    def wait(self):
+        while self.queue:
+            self.queue[0][1].result()  # Block until the next one in line is decoded
+            self.poll()
+        return self
+
+
+class AssetRegistry:
+    """Every asset loaded at most once, on first access, and shared by all modes."""
+
+    def __init__(self, loaders=LOADERS, manifests=MANIFESTS, threads=ASSET_LOAD_THREADS):
+        self.loaders = loaders
+        self.manifests = manifests
+        self.threads = threads
+        self.executor = None  # Worker pool, started by the first background preload
+        self.decoding = {}  # Name -> Future of a decode in flight, shared by every job that wants it
+        self.loaded = {}
+        self.lock = threading.RLock()
+        self.timings = {}  # Name -> (decode seconds, finish seconds)
+
+    def __getitem__(self, name):
+        asset = self.loaded.get(name)
+        if asset is None:
+            with self.lock:
+                asset = self.loaded.get(name)
+                if asset is None:
+                    asset = self.finish(name, self.decode(name))
+        return asset
+
+    def __contains__(self, name):
+        return name in self.loaders
+
+    def get(self, name, default=None):
+        return self[name] if name in self.loaders else default
+
+    def decode(self, name):
+        start = time.perf_counter()
+        decoded = self.loaders[name].decode()
+        return decoded, time.perf_counter() - start
+
+    def submit(self, name):
+        future = self.decoding.get(name)
+        if future is None or future.cancelled():
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.threads, thread_name_prefix='assets')
+            future = self.decoding[name] = self.executor.submit(self.decode, name)
+        return future
+
+    def finish(self, name, result):
+        # Main thread: turn a decode() result into the asset and keep it
+        decoded, decode_seconds = result
+        self.decoding.pop(name, None)
+        with self.lock:
+            asset = self.loaded.get(name)
+            if asset is not None:
+                return asset  # Someone asked for it while it was decoding
+            start = time.perf_counter()
+            asset = self.loaded[name] = self.loaders[name].finish(decoded, self)
+            finish_seconds = time.perf_counter() - start
+        self.timings[name] = (decode_seconds, finish_seconds)
+        log.debug("loaded %s: decode %.1f ms, finish %.1f ms", name, decode_seconds * 1000, finish_seconds * 1000)
+        return asset
+
+    def preload(self, mode, background=False):
+        """Load everything `mode` uses now, or start decoding it on worker threads and return the LoadJob."""
+        job = LoadJob(self, self.manifests[mode])
+        if background:
+            return job
+        return job.wait()
+
+    def unload(self, mode, keep=()):
+        """Drop what `mode` loaded, except assets the modes in `keep` also use. They reload on next access."""
+        kept = {name for other in keep for name in self.manifests[other]}
+        dropped = []
+        with self.lock:
+            for name in self.manifests[mode]:
+                if name not in kept and name in self.loaded:
+                    dropped.append(self.loaded.pop(name))
+        transform_cache.discard(surfaces(dropped))
+        return len(dropped)
+
+    def slowest(self, count=10):
+        """(name, decode seconds, finish seconds) for the assets that took longest, slowest first."""
+        ranked = sorted(self.timings.items(), key=lambda item: sum(item[1]), reverse=True)
+        return [(name, decode, finish) for name, (decode, finish) in ranked[:count]]
+
+    def stats(self):
+        loaded = list(self.loaded.values())
+        return {
+            'loaded': len(loaded),
+            'known': len(self.loaders),
+            # Atlas views share their sheet's pixels, so only surfaces owning pixels count
+            'bytes': sum(surface_bytes(surface) for surface in surfaces(loaded) if surface.get_parent() is None),
+            'load_seconds': sum(decode + finish for decode, finish in self.timings.values()),
+        }
+
+
+def surfaces(assets):
+    # Every Surface in a list of assets, looking inside frame lists, dicts of them and atlases
+    for asset in assets:
+        if isinstance(asset, pygame.Surface):
+            yield asset
+        elif isinstance(asset, Atlas):
+            yield asset.sheet
+        elif isinstance(asset, dict):
+            yield from surfaces(asset.values())
+        elif isinstance(asset, list):
+            yield from surfaces(asset)
+
+
+# The one registry every module shares
+assets = AssetRegistry()
+
+def load_assets():
+    # Kept for callers of the old eager loader: the shared registry, which loads on first access
     return assets
@@ -1,7 +1,13 @@
 import pygame
 import random
 import math
-from settings import WIDTH, HEIGHT  # Import screen dimensions from settings
+from settings import WIDTH, HEIGHT, ROCKET_TARGET_LOCK, ASTEROID_SIZE_STEP  # Import screen dimensions from settings
+from sim_clock import sim_clock
+from game_assets import build_ship_frames
+from collision import get_mask
+from pool import Pool, PooledSprite
+from particles import ParticleEmitter
+from transform_cache import transform_cache
 
 game_speed_multiplier = 1.0
 
@@ -9,8 +15,11 @@ def set_game_speed_multiplier(value):
     global game_speed_multiplier
     game_speed_multiplier = value
 
+# Orange rocket exhaust; the game loop updates and draws it alongside all_sprites
+rocket_trails = ParticleEmitter((255, 165, 0, 150), size_range=(2, 4), spread=1, lifetime=500, start_alpha=150)
+
 class Player(pygame.sprite.Sprite):
-    def __init__(self, image, thruster_frames, bullets_group, rockets_group, all_sprites_group, targets_group, assets, controls, facing_left=False):
+    def __init__(self, image, thruster_frames, bullets_group, rockets_group, all_sprites_group, targets_group, assets, controls, facing_left=False, target_index=None, ship_frames=None):
         super().__init__()
         self.assets = assets
         self.original_image = image  # Reference to the original ship image
@@ -22,9 +31,9 @@ class Player(pygame.sprite.Sprite):
         self.rockets_group = rockets_group
         self.all_sprites_group = all_sprites_group
         self.targets_group = targets_group
+        self.target_index = target_index  # Shared nearest-target grid handed to every rocket
         self.shoot_delay = 500  # Default shoot delay in milliseconds
-        self.last_shot = pygame.time.get_ticks()
-        self.paused = False
+        self.last_shot = sim_clock.get_ticks()
         self.powered_up = False
         self.powerup_end_time = 0
         self.rocket_count = 3  # Starting number of rockets
@@ -34,22 +43,29 @@ class Player(pygame.sprite.Sprite):
         # Thruster animation attributes
         self.thruster_frames = thruster_frames
         self.current_thruster_frame = 0
-        self.last_thruster_update = pygame.time.get_ticks()
+        self.last_thruster_update = sim_clock.get_ticks()
         self.thruster_frame_rate = 50  # Milliseconds between thruster frames
+        # Prebuilt ship + thruster composites, one per thruster frame
+        if ship_frames is None:
+            ship_frames = build_ship_frames(image, thruster_frames, facing_left)
+        self.ship_frames = ship_frames
+        self.ship_masks = [get_mask(frame) for frame in ship_frames]  # Shared per composite frame
 
         # Controls
         self.controls = controls
         self.alive = True  # Player's alive status
         self.facing_left = facing_left
         self.bullet_speedx = -10 if self.facing_left else 10
-        self.last_rocket = pygame.time.get_ticks()
+        # Flipped once here rather than on every shot
+        self.bullet_img = transform_cache.flip(assets['bullet_img'], True, False) if facing_left else assets['bullet_img']
+        self.last_rocket = sim_clock.get_ticks()
         self.rocket_delay = 700  # Delay between rocket launches in milliseconds
 
         # Track the number of bullets to shoot with spread power-up
         self.spread_bullet_count = 1  # Starts with 1, increased by power-ups
 
     def update(self):
-        if self.paused or not self.alive:
+        if not self.alive:
             return
 
         self.speedx = 0
@@ -97,78 +113,38 @@ class Player(pygame.sprite.Sprite):
         self.update_thruster()
 
         # Check if power-up effect has ended
-        if self.powered_up and pygame.time.get_ticks() > self.powerup_end_time:
+        if self.powered_up and sim_clock.get_ticks() > self.powerup_end_time:
             self.shoot_delay = 500  # Reset to default
             self.powered_up = False
 
     def update_thruster(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if now - self.last_thruster_update > self.thruster_frame_rate:
             self.last_thruster_update = now
             self.current_thruster_frame = (self.current_thruster_frame + 1) % len(self.thruster_frames)
 
-        # Get the current thruster frame
-        thruster_frame = self.thruster_frames[self.current_thruster_frame]
-        # Create a new surface to hold both the ship and thruster
-        if self.facing_left:
-            # Flip the thruster frame horizontally for facing left
-            thruster_frame = pygame.transform.flip(thruster_frame, True, False)
-            total_width = self.original_image.get_width() + thruster_frame.get_width()
-            total_height = max(self.original_image.get_height(), thruster_frame.get_height())
-            new_image = pygame.Surface((total_width, total_height), pygame.SRCALPHA)
-            # Blit the ship onto the new image
-            ship_rect = self.original_image.get_rect()
-            ship_rect.left = 0  # Ship on the left
-            ship_rect.centery = total_height // 2
-            new_image.blit(self.original_image, ship_rect)
-            # Blit the thruster onto the new image
-            thruster_rect = thruster_frame.get_rect()
-            thruster_rect.left = self.original_image.get_width()  # Thruster to the right of ship
-            thruster_rect.centery = total_height // 2
-            new_image.blit(thruster_frame, thruster_rect)
-        else:
-            total_width = self.original_image.get_width() + thruster_frame.get_width()
-            total_height = max(self.original_image.get_height(), thruster_frame.get_height())
-            new_image = pygame.Surface((total_width, total_height), pygame.SRCALPHA)
-            # Blit the thruster onto the new image
-            thruster_rect = thruster_frame.get_rect()
-            thruster_rect.left = 0  # Thruster on the left
-            thruster_rect.centery = total_height // 2
-            new_image.blit(thruster_frame, thruster_rect)
-            # Blit the ship onto the new image
-            ship_rect = self.original_image.get_rect()
-            ship_rect.left = thruster_frame.get_width()  # Ship to the right of thruster
-            ship_rect.centery = total_height // 2
-            new_image.blit(self.original_image, ship_rect)
-        # Update image and rect
-        self.image = new_image
+        # Swap in the prebuilt composite and its mask for the current thruster frame
+        self.image = self.ship_frames[self.current_thruster_frame]
+        self.mask = self.ship_masks[self.current_thruster_frame]
         # Preserve the center position
         old_center = self.rect.center
         self.rect = self.image.get_rect()
         self.rect.center = old_center
 
     def shoot(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if now - self.last_shot > self.shoot_delay:
-            if self.facing_left:
-                bullet_img = pygame.transform.flip(self.assets['bullet_img'], True, False)
-                # Fire multiple bullets with spread
-                spread_angle = 10  # Angle between each bullet
-                start_angle = -(self.spread_bullet_count - 1) * (spread_angle / 2)
-                for i in range(self.spread_bullet_count):
-                    angle = start_angle + (i * spread_angle)
-                    bullet = Bullet(self.rect.left, self.rect.centery, bullet_img, speedx=-10, angle=angle)
-                    self.bullets_group.add(bullet)
-                    self.all_sprites_group.add(bullet)
-            else:
-                spread_angle = 10
-                start_angle = -(self.spread_bullet_count - 1) * (spread_angle / 2)
-                for i in range(self.spread_bullet_count):
-                    angle = start_angle + (i * spread_angle)
-                    bullet = Bullet(self.rect.right, self.rect.centery, self.assets['bullet_img'], speedx=10, angle=angle)
-                    self.bullets_group.add(bullet)
-                    self.all_sprites_group.add(bullet)
-            
+            # Fire multiple bullets with spread
+            spread_angle = 10  # Angle between each bullet
+            start_angle = -(self.spread_bullet_count - 1) * (spread_angle / 2)
+            for i in range(self.spread_bullet_count):
+                angle = start_angle + (i * spread_angle)
+                speedy = self.bullet_speedx * math.tan(math.radians(angle))  # Vertical speed for the spread angle
+                if self.facing_left:
+                    self.bullets_group.fire(self.bullet_img, self.bullet_speedx, speedy, midright=(self.rect.left, self.rect.centery))
+                else:
+                    self.bullets_group.fire(self.bullet_img, self.bullet_speedx, speedy, midleft=(self.rect.right, self.rect.centery))
+
             self.last_shot = now
             self.assets['gun_sound'].play()
             
@@ -180,58 +156,26 @@ class Player(pygame.sprite.Sprite):
         if self.rockets_group is None or self.targets_group is None:
             return  # Rockets not used
 
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if self.rocket_count > 0 and now - self.last_rocket > self.rocket_delay:
-            rocket = Rocket(self.rect.centerx, self.rect.centery, self.assets['rocket_img'], self.targets_group, self.assets, self.all_sprites_group)
+            rocket = Rocket(self.rect.centerx, self.rect.centery, self.assets['rocket_img'], self.targets_group, self.assets, self.all_sprites_group, self.target_index)
             self.rockets_group.add(rocket)
             self.all_sprites_group.add(rocket)
             self.last_rocket = now
             self.rocket_count -= 1
             self.assets['rocket_sound'].play()
 
-    def pause(self):
-        self.paused = not self.paused
-
     def power_up(self):
         self.shoot_delay = 200  # Faster shooting
         self.powered_up = True
-        self.powerup_end_time = pygame.time.get_ticks() + 5000  # Effect lasts 5 seconds
+        self.powerup_end_time = sim_clock.get_ticks() + 5000  # Effect lasts 5 seconds
 
     def add_rockets(self, amount):
         self.rocket_count += amount
 
 
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, image, speedx=10, angle=0):
-        super().__init__()
-        self.image = image
-        self.rect = self.image.get_rect()
-        if speedx > 0:
-            self.rect.left = x
-        else:
-            self.rect.right = x
-        self.rect.centery = y
-        self.speedx = speedx
-        self.angle = angle  # Angle for the spread effect
-        self.speedy = speedx * math.tan(math.radians(angle))  # Calculate vertical speed based on the angle
-        self.paused = False
-
-    def update(self):
-        if self.paused:
-            return
-
-        # Bullets not affected by game_speed_multiplier
-        self.rect.x += self.speedx
-        self.rect.y += self.speedy
-        if self.rect.left > WIDTH or self.rect.right < 0:
-            self.kill()
-
-    def pause(self):
-        self.paused = not self.paused
-
-
 class Rocket(pygame.sprite.Sprite):
-    def __init__(self, x, y, image, targets_group, assets, all_sprites_group):
+    def __init__(self, x, y, image, targets_group, assets, all_sprites_group, target_index=None, lock_target=ROCKET_TARGET_LOCK):
         super().__init__()
         self.original_image = image
         self.image = self.original_image.copy()
@@ -242,12 +186,17 @@ class Rocket(pygame.sprite.Sprite):
         self.rotation_speed = 2  # Controls how fast the rocket rotates
         self.angle = 0  # Initial angle
         self.targets_group = targets_group
+        self.target_index = target_index  # Per-frame grid over targets_group, shared by all rockets
+        self.lock_target = lock_target  # Keep chasing the current target until it dies
+        self.target = None
         self.assets = assets
-        self.paused = False
         self.all_sprites_group = all_sprites_group  # Reference to all_sprites_group
 
     def find_nearest_target(self):
         # Find the nearest target (enemy or asteroid)
+        if self.target_index is not None:
+            return self.target_index.nearest(self.rect.centerx, self.rect.centery)
+
         nearest_target = None
         min_distance = float('inf')
         for sprite in self.targets_group.sprites():
@@ -261,12 +210,10 @@ class Rocket(pygame.sprite.Sprite):
         return nearest_target
 
     def update(self):
-        if self.paused:
-            return
-
         # Rockets not affected by game_speed_multiplier
-        # Always find the nearest target every frame
-        self.target = self.find_nearest_target()
+        # Find the nearest target every frame, unless locked onto one that is still alive
+        if not (self.lock_target and self.target is not None and self.target in self.targets_group):
+            self.target = self.find_nearest_target()
 
         if self.target:
             # Calculate direction towards the target
@@ -290,7 +237,7 @@ class Rocket(pygame.sprite.Sprite):
             self.rect.y += self.speed * math.sin(rad_angle)
 
             # Update the rocket's image with smooth rotation
-            self.image = pygame.transform.rotate(self.original_image, -self.angle)
+            self.image = transform_cache.rotate(self.original_image, -self.angle)
             self.rect = self.image.get_rect(center=self.rect.center)
         else:
             # If no target, move straight in the current direction
@@ -299,53 +246,13 @@ class Rocket(pygame.sprite.Sprite):
             self.rect.y += self.speed * math.sin(rad_angle)
 
         # Emit trail particles
-        trail_particle = RocketTrailParticle(self.rect.centerx, self.rect.centery)
-        self.all_sprites_group.add(trail_particle)
+        rocket_trails.emit(self.rect.centerx, self.rect.centery)
 
         # Destroy the rocket if it goes off the screen
         if (self.rect.right < 0 or self.rect.left > WIDTH or
                 self.rect.bottom < 0 or self.rect.top > HEIGHT):
             self.kill()
 
-    def pause(self):
-        self.paused = not self.paused
-
-
-class RocketTrailParticle(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        # Randomize particle properties
-        self.size = random.randint(2, 4)  # Size of the particle
-        self.color = (255, 165, 0, 150)  # Orange color with some transparency
-        self.image = pygame.Surface((self.size*2, self.size*2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, self.color, (self.size, self.size), self.size)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.speedx = random.uniform(-1, 1)
-        self.speedy = random.uniform(-1, 1)
-        self.lifetime = 500  # Lifetime in milliseconds
-        self.spawn_time = pygame.time.get_ticks()
-        self.fade_rate = 150 / self.lifetime  # Alpha decrement per millisecond
-
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        elapsed_time = current_time - self.spawn_time
-
-        if elapsed_time > self.lifetime:
-            self.kill()
-            return
-
-        # Move the particle
-        self.rect.x += self.speedx
-        self.rect.y += self.speedy
-
-        # Fade out
-        alpha = max(0, self.color[3] - (elapsed_time * self.fade_rate))
-        self.image.set_alpha(alpha)
-
-    def pause(self):
-        # Optional: Implement pause functionality if needed
-        pass
-
 
 class Enemy(pygame.sprite.Sprite):
     def __init__(self, image, enemy_bullets_group, all_sprites_group, assets, move_randomly=False, level=1):
@@ -361,21 +268,19 @@ class Enemy(pygame.sprite.Sprite):
         self.enemy_bullets_group = enemy_bullets_group
         self.all_sprites_group = all_sprites_group
         self.shoot_delay = random.randint(1500, 3000) - (level - 1) * 100  # Faster shooting with level
-        self.last_shot = pygame.time.get_ticks()
-        self.paused = False
+        self.last_shot = sim_clock.get_ticks()
         self.move_randomly = move_randomly
         if self.move_randomly:
             self.speedy = random.choice([-2, -1, 0, 1, 2])
         # Thruster animation attributes
         self.thruster_frames = assets['enemy_thruster_frames']
+        self.ship_frames = assets['enemy_frames']  # Prebuilt ship + flipped thruster composites
+        self.ship_masks = [get_mask(frame) for frame in self.ship_frames]  # Shared per composite frame
         self.current_thruster_frame = 0
-        self.last_thruster_update = pygame.time.get_ticks()
+        self.last_thruster_update = sim_clock.get_ticks()
         self.thruster_frame_rate = 50  # Milliseconds between thruster frames
 
     def update(self):
-        if self.paused:
-            return
-
         self.rect.x += self.speedx * game_speed_multiplier
         self.rect.y += self.speedy * game_speed_multiplier
 
@@ -391,73 +296,25 @@ class Enemy(pygame.sprite.Sprite):
         self.update_thruster()
 
     def update_thruster(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if now - self.last_thruster_update > self.thruster_frame_rate:
             self.last_thruster_update = now
             self.current_thruster_frame = (self.current_thruster_frame + 1) % len(self.thruster_frames)
 
-        # Get the current thruster frame
-        thruster_frame = self.thruster_frames[self.current_thruster_frame]
-        # Flip the thruster frame horizontally for the enemy
-        thruster_frame = pygame.transform.flip(thruster_frame, True, False)
-        # Create a new surface to hold both the ship and thruster
-        total_width = self.original_image.get_width() + thruster_frame.get_width()
-        total_height = max(self.original_image.get_height(), thruster_frame.get_height())
-        new_image = pygame.Surface((total_width, total_height), pygame.SRCALPHA)
-        # Blit the ship onto the new image
-        ship_rect = self.original_image.get_rect()
-        ship_rect.left = 0  # Ship on the left
-        ship_rect.centery = total_height // 2
-        new_image.blit(self.original_image, ship_rect)
-        # Blit the thruster onto the new image
-        thruster_rect = thruster_frame.get_rect()
-        thruster_rect.left = self.original_image.get_width()  # Thruster to the right of ship
-        thruster_rect.centery = total_height // 2
-        new_image.blit(thruster_frame, thruster_rect)
-        # Update image and rect
-        self.image = new_image
+        # Swap in the prebuilt composite and its mask for the current thruster frame
+        self.image = self.ship_frames[self.current_thruster_frame]
+        self.mask = self.ship_masks[self.current_thruster_frame]
         # Preserve the center position
         old_center = self.rect.center
         self.rect = self.image.get_rect()
         self.rect.center = old_center
 
     def shoot(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if now - self.last_shot > self.shoot_delay:
-            bullet = EnemyBullet(self.rect.left, self.rect.centery, self.assets['enemy_bullet_img'])
-            self.enemy_bullets_group.add(bullet)
-            self.all_sprites_group.add(bullet)  # Add enemy bullet to all_sprites
+            self.enemy_bullets_group.fire(self.assets['enemy_bullet_img'], -8, center=(self.rect.left, self.rect.centery))
             self.last_shot = now
 
-    def pause(self):
-        self.paused = not self.paused
-
-
-class EnemyBullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, image, speedx=-8, speedy=0):
-        super().__init__()
-        self.image = image
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.centery = y
-        self.speedx = speedx
-        self.speedy = speedy
-        self.paused = False
-
-    def update(self):
-        if self.paused:
-            return
-
-        # Enemy bullets are affected by game_speed_multiplier
-        self.rect.x += self.speedx * game_speed_multiplier
-        self.rect.y += self.speedy * game_speed_multiplier
-        if (self.rect.right < 0 or self.rect.left > WIDTH or
-                self.rect.bottom < 0 or self.rect.top > HEIGHT):
-            self.kill()
-
-    def pause(self):
-        self.paused = not self.paused
-
 
 class Boss(pygame.sprite.Sprite):
     def __init__(self, image, enemy_bullets_group, all_sprites_group, assets, level=1):
@@ -471,22 +328,18 @@ class Boss(pygame.sprite.Sprite):
         self.enemy_bullets_group = enemy_bullets_group
         self.all_sprites_group = all_sprites_group
         self.shoot_delay = max(500, 1000 - (level - 1) * 100)  # Increase shooting rate with level
-        self.last_shot = pygame.time.get_ticks()
-        self.paused = False
+        self.last_shot = sim_clock.get_ticks()
         # Adjust health so that at level 1, boss has lower health
         self.health = 5 + (level - 1) * 5  # Health increases with level
 
     def update(self):
-        if self.paused:
-            return
-
         self.rect.x += self.speedx * game_speed_multiplier
         if self.rect.right <= WIDTH - 150:
             self.speedx = 0  # Boss stops moving horizontally after reaching position
         self.shoot()
 
     def shoot(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if now - self.last_shot > self.shoot_delay:
             # Boss fires bullets in multiple directions
             bullet_angles = [-60, -45, -30, -15, 0, 15, 30, 45, 60]
@@ -494,9 +347,7 @@ class Boss(pygame.sprite.Sprite):
                 rad = math.radians(angle)
                 speedx = -8 * math.cos(rad)
                 speedy = -8 * math.sin(rad)
-                bullet = EnemyBullet(self.rect.centerx, self.rect.centery, self.assets['enemy_bullet_img'], speedx, speedy)
-                self.enemy_bullets_group.add(bullet)
-                self.all_sprites_group.add(bullet)
+                self.enemy_bullets_group.fire(self.assets['enemy_bullet_img'], speedx, speedy, center=self.rect.center)
             self.last_shot = now
 
     def take_damage(self, amount):
@@ -504,9 +355,6 @@ class Boss(pygame.sprite.Sprite):
         if self.health <= 0:
             self.kill()
 
-    def pause(self):
-        self.paused = not self.paused
-
 
 class Asteroid(pygame.sprite.Sprite):
     def __init__(self, image, size='large'):
@@ -541,28 +389,28 @@ class Asteroid(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.x = WIDTH + random.randint(5, 10)
         self.rect.y = random.randint(0, HEIGHT - self.rect.height)
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = sim_clock.get_ticks()
         self.rotation_delay = 50  # Rotate every 50 milliseconds
 
     def get_scaled_image(self):
         """Return the scaled asteroid image based on its size."""
         if self.size == 'large':
             random_size = random.randint(80, 150)  # Random size between 80 and 150 for large asteroids
-            return pygame.transform.scale(self.original_image, (random_size, random_size))  # Random large asteroid size
+            return transform_cache.scale(self.original_image, (random_size, random_size), ASTEROID_SIZE_STEP)  # Random large asteroid size
         elif self.size == 'medium':
             random_size = random.randint(40, 80)  # Random size between 40 and 80 for medium asteroids
-            return pygame.transform.scale(self.original_image, (random_size, random_size))  # Random medium asteroid size
+            return transform_cache.scale(self.original_image, (random_size, random_size), ASTEROID_SIZE_STEP)  # Random medium asteroid size
         elif self.size == 'small':
             random_size = random.randint(20, 40)  # Random size between 20 and 40 for small asteroids
-            return pygame.transform.scale(self.original_image, (random_size, random_size))  # Random small asteroid size
+            return transform_cache.scale(self.original_image, (random_size, random_size), ASTEROID_SIZE_STEP)  # Random small asteroid size
 
     def update(self):
         # Update rotation for all asteroid sizes
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if now - self.last_update > self.rotation_delay:
             self.last_update = now
             self.angle += self.rotation_speed * game_speed_multiplier
-            self.image = pygame.transform.rotate(self.original_image, self.angle)  # Rotate scaled image
+            self.image = transform_cache.rotate(self.original_image, self.angle)  # Rotate scaled image, shared per angle bucket
             self.rect = self.image.get_rect(center=self.rect.center)
 
         # Update position
@@ -600,56 +448,30 @@ class PowerUp(pygame.sprite.Sprite):
         self.rect.x = WIDTH + random.randint(50, 100)
         self.rect.y = random.randint(0, HEIGHT - self.rect.height)
         self.speedx = -3
-        self.paused = False
         self.type = powerup_type  # Type of power-up
 
     def update(self):
-        if self.paused:
-            return
-
         self.rect.x += self.speedx  # Not affected by game_speed_multiplier
         if self.rect.right < 0:
             self.kill()
 
-    def pause(self):
-        self.paused = not self.paused
 
-
-class Explosion(pygame.sprite.Sprite):
-    def __init__(self, center, spritesheet):
+class Explosion(PooledSprite):
+    def __init__(self, center, frames):
         super().__init__()
-        self.spritesheet = spritesheet
-        self.frames = []
-        self.load_frames()
+        self.reset(center, frames)
+
+    def reset(self, center, frames):
+        self.frames = frames  # Shared, pre-sliced animation from assets['explosion_frames']
         self.image = self.frames[0]
         self.rect = self.image.get_rect()
         self.rect.center = center
         self.frame_index = 0
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = sim_clock.get_ticks()
         self.frame_rate = 50  # Milliseconds between frames
 
-    def load_frames(self):
-        sheet_width = self.spritesheet.get_width()
-        sheet_height = self.spritesheet.get_height()
-        columns = 5
-        rows = 1
-        frame_width = sheet_width // columns
-        frame_height = sheet_height // rows
-
-        for row in range(rows):
-            for col in range(columns):
-                frame = self.spritesheet.subsurface(
-                    pygame.Rect(
-                        col * frame_width,
-                        row * frame_height,
-                        frame_width,
-                        frame_height
-                    )
-                )
-                self.frames.append(frame)
-
     def update(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if now - self.last_update > self.frame_rate:
             self.last_update = now
             self.frame_index += 1
@@ -662,26 +484,5 @@ class Explosion(pygame.sprite.Sprite):
                 self.rect.center = center
 
 
-class Star:
-    def __init__(self, x, y, speed, size, opacity):
-        self.x = x
-        self.y = y
-        self.speed = speed
-        self.size = size
-        self.opacity = opacity
-
-    def update(self):
-        self.x -= self.speed  # Not affected by game_speed_multiplier
-        if self.x < 0:
-            self.x = WIDTH
-            self.y = random.randint(0, HEIGHT)
-
-    def draw(self, surface):
-        star_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(
-            star_surface,
-            (255, 255, 255, self.opacity),
-            (self.size, self.size),
-            self.size,
-        )
-        surface.blit(star_surface, (int(self.x), int(self.y)))
+# Free list for explosions; acquire() reuses instances that kill() handed back
+explosion_pool = Pool(Explosion)
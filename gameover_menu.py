@@ -1,5 +1,6 @@
 import pygame
 import sys
+from fonts import fonts
 
 # Define colors
 WHITE = (255, 255, 255)
@@ -38,10 +39,16 @@ class Button:
         pygame.draw.rect(surface, color, rect, border_radius=5)
 
         # Render the text and center it in the button
-        font = pygame.font.Font(None, self.text_size)
-        text_surface = font.render(self.text, True, WHITE)
+        text_surface = fonts.label(self.text, self.text_size, WHITE)
         text_rect = text_surface.get_rect(center=rect.center)
         surface.blit(text_surface, text_rect)
+        return rect
+
+    def bounds(self):
+        # Everything draw() can touch: the button at its grown size
+        rect = pygame.Rect(0, 0, int(self.width * self.growth_factor), int(self.height * self.growth_factor))
+        rect.center = self.rect.center
+        return rect
 
     def update(self, mouse_pos, play_hover_sound):
         # Check if the button is hovered
@@ -51,12 +58,15 @@ class Button:
         self.hovered = is_hovered
 
 class GameOverMenu:
-    def __init__(self, screen, winner, click_sound, hover_sound):
+    def __init__(self, screen, winner, click_sound, hover_sound, renderer=None):
         self.screen = screen
         self.winner = winner
         self.click_sound = click_sound
         self.hover_sound = hover_sound
-        self.font = pygame.font.Font(None, 72)  # Font for "Game Over"
+        self.renderer = renderer  # A dirty rect Renderer makes the menu push only its buttons after the first frame
+        if renderer is not None:
+            renderer.invalidate()
+        self.drawn_state = None  # Button (hovered, selected) states last drawn
         self.buttons = [
             Button("RETRY", screen.get_width() // 2 - 100, screen.get_height() // 2 + 50, 200, 60, (70, 70, 70), HOVER_GREEN, action="retry"),
             Button("MAIN MENU", screen.get_width() // 2 - 100, screen.get_height() // 2 + 120, 200, 60, (70, 70, 70), HOVER_RED, action="main_menu"),
@@ -65,23 +75,37 @@ class GameOverMenu:
         self.buttons[self.current_index].selected = True  # Initially, select the first button
 
     def draw(self):
-        # Draw the background
-        self.screen.fill(BACKGROUND_COLOR)
-        
-        # Draw the "Game Over" or "Winner" text
-        if self.winner:
-            game_over_text = self.font.render(f"{self.winner} WINS!", True, WHITE)
+        renderer = self.renderer
+        dirty = renderer is not None and renderer.dirty
+        state = [(button.hovered, button.selected) for button in self.buttons]
+        if state == self.drawn_state:
+            return  # Nothing changed: leave the frame on screen as it is
+        if dirty and not renderer.full_update:
+            # Only the buttons change after the first frame
+            for button in self.buttons:
+                renderer.mark(self.screen.fill(BACKGROUND_COLOR, button.bounds()))
         else:
-            game_over_text = self.font.render("GAME OVER", True, WHITE)
-        
-        text_rect = game_over_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 - 100))
-        self.screen.blit(game_over_text, text_rect)
+            # Draw the background
+            self.screen.fill(BACKGROUND_COLOR)
+
+            # Draw the "Game Over" or "Winner" text
+            if self.winner:
+                game_over_text = fonts.label(f"{self.winner} WINS!", 72, WHITE)
+            else:
+                game_over_text = fonts.label("GAME OVER", 72, WHITE)
+
+            text_rect = game_over_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 - 100))
+            self.screen.blit(game_over_text, text_rect)
 
         # Draw the buttons
         for button in self.buttons:
             button.draw(self.screen)
+        self.drawn_state = state
 
-        pygame.display.flip()
+        if dirty:
+            renderer.present()
+        else:
+            pygame.display.flip()
 
     def handle_event(self, event):
         # Handle keyboard navigation
@@ -0,0 +1,95 @@
+# headless.py
+# Run the game loops with no window, no audio device and no frame cap, and
+# report how many frames per second the simulation manages.
+#
+#   python headless.py --mode single --frames 10000
+#   python headless.py --mode versus --frames 5000 --render
+import argparse
+import os
+import random
+import time
+
+MODES = ('single', 'cooperative', 'versus')
+
+
+def use_dummy_drivers():
+    # Must happen before pygame is initialised, i.e. before main.init()
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+
+def simulate(mode, frames, render=False):
+    """Simulate `frames` frames of `mode`, starting a new round whenever one ends."""
+    from main import init
+    init()  # Nothing initialises pygame on import any more; with the dummy drivers this opens no window
+    if mode == 'versus':
+        from versus import versus_loop
+        run_round = lambda remaining: versus_loop(headless=True, max_frames=remaining, render=render)
+    else:
+        from game import game_loop
+        cooperative = mode == 'cooperative'
+        run_round = lambda remaining: game_loop(cooperative, headless=True, max_frames=remaining, render=render)
+
+    simulated = 0
+    rounds = 0
+    start = time.perf_counter()
+    while simulated < frames:
+        simulated += run_round(frames - simulated)
+        rounds += 1
+    elapsed = time.perf_counter() - start
+    return simulated, rounds, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Space Void simulation benchmark")
+    parser.add_argument('--mode', choices=MODES, default='single')
+    parser.add_argument('--frames', type=int, default=3600, help="number of frames to simulate")
+    parser.add_argument('--render', action='store_true', help="also draw each frame to the offscreen surface")
+    parser.add_argument('--seed', type=int, default=None, help="seed the random module for a repeatable run")
+    parser.add_argument('--asset-timings', action='store_true', help="list the slowest assets to load")
+    parser.add_argument('--profile', metavar='PATH', help="record per-phase frame times and write them to PATH (.csv or .json)")
+    args = parser.parse_args(argv)
+
+    use_dummy_drivers()
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    from collision import collision_stats
+    collision_stats.reset()
+    if args.profile:
+        from profiler import profiler
+        profiler.record(args.frames)  # Every frame of the run, not just the overlay's window
+
+    simulated, rounds, elapsed = simulate(args.mode, args.frames, args.render)
+    fps = simulated / elapsed if elapsed > 0 else float('inf')
+    print(f"{args.mode}: {simulated} frames in {rounds} round(s), {elapsed:.2f} s, {fps:.1f} frames/sec")
+    per_frame = collision_stats.per_frame()
+    print(
+        f"per frame: {per_frame['rect_tests']:.1f} rect tests, {per_frame['mask_tests']:.2f} mask tests, "
+        f"{per_frame['masks_built']:.2f} masks built"
+    )
+    from pool import pool_stats
+    for name, stats in pool_stats().items():
+        print(f"pool {name}: {stats['hits']} hits, {stats['misses']} misses, {stats['hit_rate']:.1%} hit rate")
+    from transform_cache import transform_cache
+    stats = transform_cache.stats()
+    print(
+        f"transform cache: {stats['hit_rate']:.1%} hit rate, {stats['entries']} entries, "
+        f"{stats['bytes'] / (1024 * 1024):.1f} MB, {stats['evictions']} evictions"
+    )
+    from hitch import hitches
+    hitches.flush()  # A hitch near the end still gets its dump
+    print(f"hitches: {hitches.hitch_count} frames over {hitches.budget_ms} ms, {len(hitches.dumps)} dump(s)", *hitches.dumps)
+    if args.profile:
+        for name, (p50, p95, p99) in profiler.percentiles().items():
+            print(f"phase {name}: p50 {p50:.3f} ms, p95 {p95:.3f} ms, p99 {p99:.3f} ms")
+        profiler.export(args.profile)
+        print("profile written to", args.profile)
+    if args.asset_timings:
+        from game_assets import assets
+        for name, decode, finish in assets.slowest():
+            print(f"asset {name}: decode {decode * 1000:.1f} ms, finish {finish * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
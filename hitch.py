@@ -0,0 +1,126 @@
+# hitch.py
+# Hitch recorder, cheap enough to leave on. Every frame appends one tuple of
+# its duration and entity counts to a ring buffer of the last HITCH_FRAMES
+# frames; the scenes log spawns, kills and power-ups with event(), and a gc
+# callback logs every collection. When a frame's work runs over
+# HITCH_BUDGET_MS, a dump is scheduled HITCH_FRAMES_AFTER frames later, so it
+# shows what led up to the stall and what followed it, and written to
+# HITCH_DUMP_DIR as gzipped, columnar JSON of a few kilobytes.
+import atexit
+import gc
+import gzip
+import json
+import os
+import time
+from collections import deque
+
+from settings import (
+    HITCH_RECORDER, HITCH_BUDGET_MS, HITCH_FRAMES, HITCH_FRAMES_AFTER, HITCH_DUMP_DIR, HITCH_MAX_DUMPS,
+)
+
+
+class HitchRecorder:
+    def __init__(self, frames=HITCH_FRAMES, budget_ms=HITCH_BUDGET_MS, enabled=HITCH_RECORDER):
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self.frames = deque(maxlen=frames)  # (frame number, scene, ms, {group: count})
+        self.events = deque(maxlen=frames * 4)  # (frame number, kind, detail)
+        self.collections = deque(maxlen=frames)  # (frame number, generation, ms, collected)
+        self.frame_number = 0
+        self.frame_start = 0.0
+        self.exempt_frame = False
+        self.gc_start = 0.0
+        self.hitches = []  # Frame numbers over budget since the last dump
+        self.dump_at = None  # Frame number the pending dump is written after
+        self.hitch_count = 0
+        self.dumps = []  # Paths written this run
+        self.installed = False
+
+    def install(self):
+        """Start logging garbage collections and flush a pending dump at exit. Safe to call again."""
+        if self.installed or not self.enabled:
+            return
+        gc.callbacks.append(self.on_gc)
+        atexit.register(self.flush)
+        self.installed = True
+
+    def on_gc(self, phase, info):
+        if phase == 'start':
+            self.gc_start = time.perf_counter()
+        else:
+            ms = (time.perf_counter() - self.gc_start) * 1000
+            self.collections.append((self.frame_number, info['generation'], round(ms, 3), info['collected']))
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def event(self, kind, detail=None):
+        # kind: 'spawn', 'kill', 'powerup', 'death', 'switch'...; detail: what spawned, died or was picked up
+        if self.enabled:
+            self.events.append((self.frame_number, kind, detail))
+
+    def exempt(self):
+        """Record this frame but don't call it a hitch: it loads a scene on purpose."""
+        self.exempt_frame = True
+
+    def end_frame(self, scene=None, entity_counts=None):
+        # entity_counts: a function returning {group name: count}
+        if not self.enabled:
+            return
+        ms = (time.perf_counter() - self.frame_start) * 1000
+        number = self.frame_number
+        self.frames.append((number, scene, ms, entity_counts() if entity_counts is not None else {}))
+        if ms > self.budget_ms and not self.exempt_frame:
+            self.hitch_count += 1
+            self.hitches.append(number)
+            if self.dump_at is None:
+                self.dump_at = number + HITCH_FRAMES_AFTER
+        self.exempt_frame = False
+        self.frame_number += 1
+        if self.dump_at is not None and number >= self.dump_at:
+            self.flush()
+
+    def flush(self):
+        """Write the pending dump now, if there is one; returns its path or None."""
+        if self.dump_at is None:
+            return None
+        self.dump_at = None
+        hitches, self.hitches = self.hitches, []
+        if len(self.dumps) >= HITCH_MAX_DUMPS or not self.frames:
+            return None
+        path = self.dump(hitches)
+        self.dumps.append(path)
+        return path
+
+    def snapshot(self, hitches=()):
+        # Columns rather than one object per frame: the names appear once and gzip does the rest
+        first = self.frames[0][0]
+        groups = list({name: None for *_, counts in self.frames for name in counts})
+        return {
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'budget_ms': self.budget_ms,
+            'hitches': list(hitches),
+            'frames': {
+                'number': [number for number, _, _, _ in self.frames],
+                'scene': [scene for _, scene, _, _ in self.frames],
+                'ms': [round(ms, 2) for _, _, ms, _ in self.frames],
+                'counts': {name: [counts.get(name) for *_, counts in self.frames] for name in groups},
+            },
+            'events': [list(event) for event in self.events if event[0] >= first],
+            'gc': [list(collection) for collection in self.collections if collection[0] >= first],
+        }
+
+    def dump(self, hitches=(), path=None):
+        """Write the ring buffer as gzipped JSON to `path`, by default a new file in HITCH_DUMP_DIR."""
+        if path is None:
+            os.makedirs(HITCH_DUMP_DIR, exist_ok=True)
+            name = time.strftime('hitch-%Y%m%d-%H%M%S') + f'-{self.frame_number}.json.gz'
+            path = os.path.join(HITCH_DUMP_DIR, name)
+        with gzip.open(path, 'wt') as f:
+            json.dump(self.snapshot(hitches), f, separators=(',', ':'))
+        return path
+
+
+# The one recorder every loop reports frames to
+hitches = HitchRecorder()
@@ -0,0 +1,84 @@
+# hud.py
+# Retained HUD: each label keeps its rendered text and only goes back to the
+# font when its value changes. Labels are composited onto one HUD surface,
+# and drawing the HUD is a single blits call copying just the labels' areas
+# of it, so a frame where no value changed does no font work at all.
+import pygame
+
+from settings import WIDTH, HEIGHT
+
+WHITE = (255, 255, 255)
+CLEAR = (0, 0, 0, 0)
+
+
+class Label:
+    def __init__(self, font, template, color=WHITE, value=None, **anchor):
+        self.font = font
+        self.template = template  # str.format template, e.g. "Score: {}"
+        self.color = color
+        self.anchor = anchor  # Where the text sits, as get_rect() keywords: topleft=, topright=, center=...
+        self.visible = True
+        self.image = None
+        self.rect = None
+        self.value = None
+        self.renders = 0
+        self.set(value)
+
+    def set(self, value):
+        # Returns True when the text was rendered again
+        if self.image is not None and value == self.value:
+            return False
+        self.value = value
+        self.image = self.font.render(self.template.format(value), True, self.color)
+        self.rect = self.image.get_rect(**self.anchor)
+        self.renders += 1
+        return True
+
+
+class Hud:
+    def __init__(self, size=(WIDTH, HEIGHT)):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.labels = {}  # Name -> Label, composited in insertion order
+        self.damage = []  # HUD areas to composite again before the next draw
+
+    def add(self, name, font, template, value=None, color=WHITE, visible=True, **anchor):
+        label = self.labels[name] = Label(font, template, color, value, **anchor)
+        label.visible = visible
+        self.damage.append(label.rect)
+        return label
+
+    def set(self, name, value):
+        label = self.labels[name]
+        old_rect = label.rect
+        if label.set(value) and label.visible:
+            self.damage += (old_rect, label.rect)
+
+    def show(self, name, visible=True):
+        label = self.labels[name]
+        if label.visible != visible:
+            label.visible = visible
+            self.damage.append(label.rect)
+
+    def composite(self):
+        surface = self.surface
+        visible = [label for label in self.labels.values() if label.visible]
+        for area in self.damage:
+            # Clear the area, then put back every label touching it, clipped so untouched pixels aren't blended twice
+            surface.fill(CLEAR, area)
+            surface.set_clip(area)
+            for label in visible:
+                if label.rect.colliderect(area):
+                    surface.blit(label.image, label.rect)
+        surface.set_clip(None)
+        self.damage.clear()
+
+    def draw(self, surface):
+        # Returns the Rects drawn, for dirty rect rendering
+        if self.damage:
+            self.composite()
+        hud = self.surface
+        return surface.blits([(hud, label.rect, label.rect) for label in self.labels.values() if label.visible])
+
+    def render_count(self):
+        # Font renders so far across all labels
+        return sum(label.renders for label in self.labels.values())
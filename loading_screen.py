@@ -0,0 +1,37 @@
+# loading_screen.py
+# Progress bar shown between the menu and a mode while the mode's assets
+# finish loading. Usually the menu has preloaded them and it never shows.
+import pygame
+import sys
+
+from fonts import fonts
+from settings import WIDTH, HEIGHT
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GREY = (70, 70, 70)
+GREEN = (0, 255, 0)
+
+
+def loading_screen(screen, job, budget=0.008):
+    """Finish a LoadJob, drawing its progress each frame; returns at once if nothing is left to load."""
+    clock = pygame.time.Clock()
+    # Finish assets for up to `budget` seconds a frame so the bar keeps moving
+    while not job.poll(budget):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+
+        screen.fill(BLACK)
+        label = fonts.label("LOADING", 48, WHITE)
+        screen.blit(label, label.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 40)))
+        bar = pygame.Rect(0, 0, 300, 24)
+        bar.center = (WIDTH // 2, HEIGHT // 2 + 10)
+        pygame.draw.rect(screen, GREY, bar, 2)
+        filled = bar.inflate(-8, -8)
+        filled.width = int(filled.width * job.progress)
+        pygame.draw.rect(screen, GREEN, filled)
+
+        pygame.display.flip()
+        clock.tick(60)
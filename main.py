@@ -1,34 +1,170 @@
 # main.py
-import pygame
+# Entry point, and the one place pygame is initialised and the window opened.
+# The other modules do nothing when imported: scenes fetch the display, fonts,
+# sounds and images once they are entered.
+#
+#   python main.py
+#   python main.py --profile-startup
+import time
+
+started = time.perf_counter()  # Import time counts from here, interpreter startup isn't ours to cut
+
+import argparse
+import gc
 import sys
-from menu import main_menu
+
+# pygame.pkgdata imports pkg_resources, over 100 ms of setuptools, only to locate pygame's bundled
+# font; without it pkgdata reads the file straight from the pygame package, as frozen builds do
+hide_pkg_resources = 'pkg_resources' not in sys.modules
+if hide_pkg_resources:
+    sys.modules['pkg_resources'] = None  # Makes the import fail fast
+import pygame
+if hide_pkg_resources:
+    del sys.modules['pkg_resources']  # Anyone else may still import it
+
+from hitch import hitches
+from menu import MenuScene
+from profiler import profiler
 from settings import WIDTH, HEIGHT, FULLSCREEN  # Import screen dimensions from settings
 
-# Initialize Pygame and the mixer module
-pygame.init()
-pygame.mixer.init()
-pygame.font.init()  # Ensure font module is initialized
-pygame.display.set_caption("SPACE VOID v0.8")
-icon = pygame.image.load('assets/images/icon.png')
-
-# Screen dimensions
-# screen = pygame.display.set_mode((WIDTH, HEIGHT)) 
-# Set screen mode based on FULLSCREEN flag
-if FULLSCREEN:
-    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)  # Full-screen mode
-else:
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))  # Windowed mode
-
-def main():
+imported = time.perf_counter()
+
+STARTUP_TARGET_MS = 300  # Budget from launch to the first interactive menu frame
+
+
+def init():
+    """Initialise pygame and open the window; returns the display surface. Safe to call again."""
+    screen = pygame.display.get_surface()
+    if screen is not None:
+        return screen
+    hitches.install()  # From the first frame on, garbage collections are logged with the frames
+    # Only the modules the game uses, rather than everything pygame.init() starts
+    pygame.display.init()
+    pygame.font.init()  # Ensure font module is initialized
+    pygame.mixer.init()
+    pygame.display.set_caption("SPACE VOID v0.8")
+    # Set the window icon before the window exists, so it shows from the first frame
+    pygame.display.set_icon(pygame.image.load('assets/images/icon.png'))
+    # Set screen mode based on FULLSCREEN flag
+    if FULLSCREEN:
+        return pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)  # Full-screen mode
+    return pygame.display.set_mode((WIDTH, HEIGHT))  # Windowed mode
+
+
+def game_scene(cooperative):
+    from game import GameScene  # The game modules load on first use, as they always have
+    return GameScene(cooperative=cooperative)
+
+
+def versus_scene():
+    from versus import VersusScene
+    return VersusScene()
+
+
+# Scene name -> function making a fresh scene; update() returns one of these names to switch scenes
+SCENES = {
+    'menu': MenuScene,
+    'single': lambda: game_scene(cooperative=False),
+    'cooperative': lambda: game_scene(cooperative=True),
+    'versus': versus_scene,
+}
+
+
+class SceneManager:
+    """Runs one scene at a time. Each frame the scene gets update(events, elapsed_ms) and draw(); when
+    update() returns a scene name the current scene exits, is dropped, and a fresh one of that name enters.
+    Screens no longer call each other, so nothing from a finished game stays referenced on the stack."""
+
+    def __init__(self, scenes=SCENES):
+        self.scenes = scenes
+        self.scene = None
+        self.name = None  # Name of the current scene, for the profiler
+        self.clock = pygame.time.Clock()
+
+    def switch(self, name):
+        if self.scene is not None:
+            self.scene.exit()
+            self.scene = None
+            gc.collect()  # Free the old scene's sprite/group cycles now, while the next one loads, not mid-game
+        if name == 'exit':
+            pygame.quit()
+            sys.exit()
+        hitches.event('switch', name)
+        hitches.exempt()  # Loading the next scene is slow on purpose
+        self.name = name
+        self.scene = self.scenes[name]()
+        self.scene.enter()
+        self.clock.tick()  # Time spent loading isn't a slow frame for the new scene to catch up on
+
+    def frame(self, framerate=60):
+        elapsed_ms = self.clock.tick(framerate)
+        profiler.begin_frame(self.name)  # After the frame cap's sleep, which isn't the frame's work
+        hitches.begin_frame()
+        events = pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    profiler.toggle()  # Frame profiler and its overlay
+                elif event.key == pygame.K_F4 and profiler.timeline:
+                    print("profile written to", *profiler.export_all())
+        profiler.mark('events')
+        next_scene = self.scene.update(events, elapsed_ms)
+        if next_scene is not None:
+            self.switch(next_scene)
+            profiler.mark('switch')
+        else:
+            self.scene.draw()
+        profiler.end_frame(self.scene.entity_counts)
+        hitches.end_frame(self.name, self.scene.entity_counts)
+
+    def run(self, name='menu'):
+        if self.scene is None:
+            self.switch(name)
+        while True:
+            self.frame()
+
+
+def print_startup(phases):
+    # phases: (name, seconds) in the order they happened
+    total = sum(seconds for _, seconds in phases)
+    for name, seconds in phases:
+        print(f"{name:<12} {seconds * 1000:7.1f} ms {seconds / total:6.1%}")
+    verdict = "within" if total * 1000 <= STARTUP_TARGET_MS else "over"
+    print(f"{'total':<12} {total * 1000:7.1f} ms to the first frame, {verdict} the {STARTUP_TARGET_MS} ms target")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Space Void")
+    parser.add_argument(
+        '--profile-startup', action='store_true',
+        help="time import, init, asset load and the first menu frame, print them and quit",
+    )
+    args = parser.parse_args(argv)
+
+    phases = [('import', imported - started)]
+    start = time.perf_counter()
+    init()
+    phases.append(('init', time.perf_counter() - start))
+
+    start = time.perf_counter()
     pygame.mixer.music.load('assets/sounds/background_music.mp3')
     pygame.mixer.music.play(-1)  # Loop the music indefinitely
-    
+    manager = SceneManager()
+    manager.switch('menu')  # Loads the menu's images and sounds
+    phases.append(('asset load', time.perf_counter() - start))
 
-if __name__ == "__main__":
-    main()
+    start = time.perf_counter()
+    manager.frame(framerate=0)  # Uncapped: the first frame goes out as soon as it is drawn
+    phases.append(('first frame', time.perf_counter() - start))
+
+    if args.profile_startup:
+        print_startup(phases)
+        return
+    manager.run()
 
-# Set the window icon
-    pygame.display.set_icon(icon)
 
-    while True:
-        main_menu() 
\ No newline at end of file
+if __name__ == "__main__":
+    main()
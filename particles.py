@@ -0,0 +1,110 @@
+# particles.py
+# Array-backed particle emitter. Particles are rows in NumPy arrays rather than
+# sprites: they move and expire in whole-array operations and are drawn with a
+# single Surface.blits call from a small set of pre-rendered alpha stamps.
+import random
+
+import numpy as np
+import pygame
+
+from sim_clock import sim_clock
+
+
+def round_half_away(values):
+    # Same rounding pygame.Rect applies when a float is assigned to it
+    return np.trunc(values + np.copysign(0.5, values))
+
+
+class ParticleEmitter:
+    def __init__(self, color, size_range=(2, 4), spread=1.0, lifetime=500, start_alpha=255, capacity=1024, alpha_levels=16):
+        self.color = color  # RGBA the stamps are drawn in
+        self.start_alpha = start_alpha  # Surface alpha at spawn, fading linearly to 0 over the lifetime
+        self.size_range = size_range  # Radius range in pixels, inclusive
+        self.spread = spread  # Max speed per step on each axis
+        self.lifetime = lifetime  # Milliseconds of simulation time
+        self.alpha_levels = alpha_levels
+        self.stamps = None  # Built on first draw, once pygame is up
+        self.count = 0
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        old_count = self.count
+        fields = {
+            'x': np.float64, 'y': np.float64,  # Top-left of the stamp, kept on whole pixels
+            'vx': np.float64, 'vy': np.float64,
+            'spawn_time': np.float64,
+            'size': np.int16,
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype)
+            if old_count:
+                array[:old_count] = getattr(self, name)[:old_count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y):
+        # Drawn from the shared random module so seeded runs stay reproducible
+        size = random.randint(*self.size_range)
+        vx = random.uniform(-self.spread, self.spread)
+        vy = random.uniform(-self.spread, self.spread)
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        i = self.count
+        self.x[i] = x - size
+        self.y[i] = y - size
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.spawn_time[i] = sim_clock.get_ticks()
+        self.size[i] = size
+        self.count += 1
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        # Expire particles past their lifetime, keeping the survivors packed at the front
+        alive = sim_clock.get_ticks() - self.spawn_time[:n] <= self.lifetime
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            n = len(keep)
+            for array in (self.x, self.y, self.vx, self.vy, self.spawn_time, self.size):
+                array[:n] = array[keep]
+            self.count = n
+        self.x[:n] = round_half_away(self.x[:n] + self.vx[:n])
+        self.y[:n] = round_half_away(self.y[:n] + self.vy[:n])
+
+    def build_stamps(self):
+        # One pre-rendered circle per (size, alpha level); level 0 is fully faded
+        min_size, max_size = self.size_range
+        levels = self.alpha_levels
+        self.stamps = []
+        for size in range(min_size, max_size + 1):
+            for level in range(levels):
+                stamp = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                pygame.draw.circle(stamp, self.color, (size, size), size)
+                stamp.set_alpha(round(self.start_alpha * level / (levels - 1)))
+                self.stamps.append(stamp)
+
+    def draw(self, surface, doreturn=False):
+        # doreturn: return the Rects drawn, for dirty rect rendering
+        n = self.count
+        if not n:
+            return [] if doreturn else None
+        if self.stamps is None:
+            self.build_stamps()
+        # Surface alpha fades from start_alpha at spawn to 0 at the end of the lifetime
+        age = sim_clock.get_ticks() - self.spawn_time[:n]
+        fade = np.clip(1 - age / self.lifetime, 0, 1)
+        levels = self.alpha_levels
+        stamp_index = (self.size[:n] - self.size_range[0]) * levels + np.rint(fade * (levels - 1)).astype(np.int32)
+        stamps = self.stamps
+        return surface.blits(
+            [(stamps[i], (x, y)) for i, x, y in zip(stamp_index.tolist(), self.x[:n].tolist(), self.y[:n].tolist())],
+            doreturn=doreturn,
+        )
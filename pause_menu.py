@@ -1,4 +1,5 @@
 import pygame
+from fonts import fonts
 
 # Define colors
 WHITE = (255, 255, 255)
@@ -37,10 +38,16 @@ class Button:
         pygame.draw.rect(surface, color, rect, border_radius=5)
         
         # Render the button's text and center it
-        font = pygame.font.Font(None, self.text_size)
-        text_surface = font.render(self.text, True, WHITE)
+        text_surface = fonts.label(self.text, self.text_size, WHITE)
         text_rect = text_surface.get_rect(center=rect.center)
         surface.blit(text_surface, text_rect)
+        return rect
+
+    def bounds(self):
+        # Everything draw() can touch: the button at its grown size
+        rect = pygame.Rect(0, 0, int(self.width * self.growth_factor), int(self.height * self.growth_factor))
+        rect.center = self.rect.center
+        return rect
 
     def update(self, mouse_pos, play_hover_sound):
         # Check if the mouse is hovering over the button
@@ -50,10 +57,13 @@ class Button:
         self.hovered = is_hovered
 
 class PauseMenu:
-    def __init__(self, screen, click_sound, hover_sound):
+    def __init__(self, screen, click_sound, hover_sound, renderer=None):
         self.screen = screen
         self.click_sound = click_sound
         self.hover_sound = hover_sound
+        self.renderer = renderer  # With a dirty rect Renderer the menu pushes only its buttons
+        self.backdrop = None  # The dimmed game frame, repainted under the buttons
+        self.drawn_state = None  # Button (hovered, selected) states last drawn
         self.buttons = [
             Button("RESUME", screen.get_width() // 2 - 100, screen.get_height() // 2 - 50, 200, 60, (70, 70, 70), HOVER_GREEN, action="resume"),
             Button("MAIN MENU", screen.get_width() // 2 - 100, screen.get_height() // 2 + 50, 200, 60, (70, 70, 70), HOVER_RED, action="main_menu"),
@@ -62,16 +72,43 @@ class PauseMenu:
         self.buttons[self.current_index].selected = True  # Select the first button initially
 
     def draw(self):
-        # Create a semi-transparent overlay
-        overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)  # Create a surface with alpha channel
-        overlay.fill(TRANSPARENT_BLACK)  # Fill it with semi-transparent black
-        self.screen.blit(overlay, (50, 50))  # Draw it over the entire screen
+        # The dimmed game frame is kept, so after the first frame only buttons that changed state are redrawn
+        renderer = self.renderer
+        state = [(button.hovered, button.selected) for button in self.buttons]
+        if self.backdrop is None:
+            # First paused frame: dim the frozen game once and keep it
+            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)  # Create a surface with alpha channel
+            overlay.fill(TRANSPARENT_BLACK)  # Fill it with semi-transparent black
+            self.screen.blit(overlay, (50, 50))  # Draw it over the entire screen
+            self.backdrop = self.screen.copy()
+            if renderer is not None:
+                renderer.invalidate()
+        elif state == self.drawn_state:
+            return  # Nothing changed: leave the frame on screen as it is
+        else:
+            for button in self.buttons:
+                bounds = button.bounds()
+                rect = self.screen.blit(self.backdrop, bounds, bounds)
+                if renderer is not None:
+                    renderer.mark(rect)
 
         # Draw each button
         for button in self.buttons:
-            button.draw(self.screen)
-
-        pygame.display.flip()
+            rect = button.draw(self.screen)
+            if renderer is not None:
+                renderer.mark(rect)
+        self.drawn_state = state
+
+        if renderer is not None:
+            renderer.present()
+        else:
+            pygame.display.flip()
+
+    def close(self):
+        # Called on resume: the game redraws the whole screen over the menu
+        self.backdrop = None
+        if self.renderer is not None:
+            self.renderer.invalidate()
 
     def handle_event(self, event):
         # Handle keyboard navigation
@@ -0,0 +1,61 @@
+# pool.py
+# Free lists for short-lived sprites. A pooled class derives from PooledSprite
+# and implements reset() with the same arguments as __init__; kill() hands the
+# instance back to its pool and acquire() reuses it instead of allocating.
+import pygame
+
+from settings import POOL_SIZE
+
+pools = []  # Every pool created, for pool_stats()
+
+
+class Pool:
+    def __init__(self, cls, size=POOL_SIZE):
+        self.cls = cls
+        self.size = size  # Most idle instances kept; releases beyond this are dropped
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0
+        cls.pool = self
+        pools.append(self)
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            self.hits += 1
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            return obj
+        self.misses += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj):
+        if len(self.free) < self.size:
+            self.free.append(obj)
+        else:
+            self.dropped += 1
+
+    def stats(self):
+        acquired = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / acquired if acquired else 0.0,
+            'free': len(self.free),
+            'dropped': self.dropped,
+        }
+
+
+class PooledSprite(pygame.sprite.Sprite):
+    pool = None  # Set by Pool(cls)
+
+    def kill(self):
+        # Only a sprite that was still in a group goes back, so a double kill can't release it twice
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+
+def pool_stats():
+    return {pool.cls.__name__: pool.stats() for pool in pools}
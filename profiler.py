@@ -0,0 +1,172 @@
+# profiler.py
+# Per-phase frame profiler. The loops call mark(phase) after each phase of a
+# frame (events, update, collisions, stars, draw, flip...) and the time since
+# the previous mark is charged to that phase. The last PROFILER_FRAMES frames
+# are kept for rolling p50/p95/p99, an on-screen overlay (F3) and CSV/JSON
+# export (F4, or headless.py --profile). Switched off, begin_frame() records
+# nothing and every mark() is one attribute test.
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+from fonts import fonts
+from settings import PROFILER, PROFILER_FRAMES, PROFILER_EXPORT_DIR
+
+OVERLAY_REFRESH = 0.5  # Seconds between overlay redraws; the text itself would cost a phase otherwise
+OVERLAY_BACKGROUND = (0, 0, 0, 170)
+OVERLAY_TEXT = (200, 255, 200)
+
+
+class FrameProfiler:
+    def __init__(self, frames=PROFILER_FRAMES, enabled=PROFILER):
+        self.enabled = enabled
+        self.overlay = enabled  # Show the overlay; recording works without it (headless)
+        self.timeline = deque(maxlen=frames)  # (frame number, scene, total ms, {phase: ms}, {group: count})
+        self.frame_number = 0
+        self.phases = None  # {phase: seconds} of the frame being recorded, None when not recording
+        self.scene = None
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.overlay_image = None
+        self.overlay_time = 0.0
+
+    def toggle(self):
+        self.enabled = self.overlay = not self.enabled
+        self.overlay_image = None
+
+    def record(self, frames=None):
+        """Start recording without the overlay, keeping the last `frames` frames (default: as many as now)."""
+        self.timeline = deque(maxlen=frames or self.timeline.maxlen)
+        self.frame_number = 0
+        self.enabled = True
+        self.overlay = False
+
+    def begin_frame(self, scene=None):
+        if not self.enabled:
+            return
+        self.scene = scene
+        self.phases = {}
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to `phase`; marks of one phase within a frame add up."""
+        if self.phases is None:
+            return
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self.last)
+        self.last = now
+
+    def end_frame(self, entity_counts=None):
+        # entity_counts: a function returning {group name: count}, only called while recording
+        phases = self.phases
+        if phases is None:
+            return
+        now = time.perf_counter()
+        phases['other'] = phases.get('other', 0.0) + (now - self.last)  # Whatever no mark claimed
+        counts = entity_counts() if entity_counts is not None else {}
+        self.timeline.append((
+            self.frame_number,
+            self.scene,
+            (now - self.frame_start) * 1000,
+            {phase: seconds * 1000 for phase, seconds in phases.items()},
+            counts,
+        ))
+        self.frame_number += 1
+        self.phases = None
+
+    def phase_names(self):
+        # Every phase in the window, in the order each first appeared
+        names = {}
+        for _, _, _, phases, _ in self.timeline:
+            names.update(dict.fromkeys(phases))
+        return list(names)
+
+    def percentiles(self):
+        """{phase: (p50, p95, p99)} in ms over the window, 'frame' for whole frames; a missing phase counts as 0."""
+        if not self.timeline:
+            return {}
+        columns = {'frame': [total for _, _, total, _, _ in self.timeline]}
+        for name in self.phase_names():
+            columns[name] = [phases.get(name, 0.0) for _, _, _, phases, _ in self.timeline]
+        return {name: tuple(np.percentile(values, (50, 95, 99))) for name, values in columns.items()}
+
+    def draw_overlay(self, surface):
+        """Blit the overlay in the top-right corner; returns its Rect, or None when it is off."""
+        if not (self.enabled and self.overlay) or not self.timeline:
+            return None
+        now = time.perf_counter()
+        if self.overlay_image is None or now - self.overlay_time >= OVERLAY_REFRESH:
+            self.overlay_image = self.render_overlay()
+            self.overlay_time = now
+        return surface.blit(self.overlay_image, self.overlay_image.get_rect(topright=(surface.get_width() - 4, 40)))
+
+    def render_overlay(self):
+        font = fonts.font(18)
+        rows = [['ms', 'p50', 'p95', 'p99']]
+        for name, values in self.percentiles().items():
+            rows.append([name, *(f'{value:.2f}' for value in values)])
+        rows.extend([name, str(count)] for name, count in self.timeline[-1][4].items())
+        # Rendered directly, not through fonts.label: the numbers change every refresh and would fill its cache
+        cells = [[font.render(text, True, OVERLAY_TEXT) for text in row] for row in rows]
+        # The default font isn't monospaced: names are left-aligned, numbers right-aligned in their column
+        columns = max(len(row) for row in cells)
+        widths = [max(row[i].get_width() for row in cells if i < len(row)) + 8 for i in range(columns)]
+        line_height = font.get_linesize()
+        overlay = pygame.Surface((sum(widths) + 8, line_height * len(cells) + 8), pygame.SRCALPHA)
+        overlay.fill(OVERLAY_BACKGROUND)
+        for y, row in enumerate(cells):
+            top = 4 + y * line_height
+            overlay.blit(row[0], (4, top))
+            right = 4 + widths[0]
+            for i, image in enumerate(row[1:], 1):
+                right += widths[i]
+                overlay.blit(image, image.get_rect(topright=(right - 8, top)))
+        return overlay
+
+    def export(self, path):
+        """Write the timeline as CSV or JSON, chosen by the extension."""
+        phase_names = self.phase_names()
+        count_names = list({name: None for *_, counts in self.timeline for name in counts})
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({
+                    'percentiles': {name: dict(zip(('p50', 'p95', 'p99'), values))
+                                    for name, values in self.percentiles().items()},
+                    'frames': [
+                        {'frame': number, 'scene': scene, 'total_ms': total, 'phases': phases, 'counts': counts}
+                        for number, scene, total, phases, counts in self.timeline
+                    ],
+                }, f, indent=1)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame', 'scene', 'total_ms', *phase_names, *count_names])
+                for number, scene, total, phases, counts in self.timeline:
+                    writer.writerow([
+                        number, scene, f'{total:.4f}',
+                        *(f'{phases.get(name, 0.0):.4f}' for name in phase_names),
+                        *(counts.get(name, '') for name in count_names),
+                    ])
+
+    def export_all(self):
+        """Write the timeline to PROFILER_EXPORT_DIR as both CSV and JSON; returns the two paths."""
+        os.makedirs(PROFILER_EXPORT_DIR, exist_ok=True)
+        base = os.path.join(PROFILER_EXPORT_DIR, time.strftime('frames-%Y%m%d-%H%M%S'))
+        paths = [base + '.csv', base + '.json']
+        for path in paths:
+            self.export(path)
+        return paths
+
+    def clear(self):
+        self.timeline.clear()
+        self.frame_number = 0
+        self.overlay_image = None
+
+
+# The one profiler every loop marks
+profiler = FrameProfiler()
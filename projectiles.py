@@ -0,0 +1,210 @@
+# projectiles.py
+# Structure-of-arrays store for bullets. Every live projectile is a row in
+# NumPy arrays (x, y, vx, vy, owner, alive) instead of a sprite: movement,
+# off-screen culling and the hit tests against ships and asteroids run as
+# whole-array operations. ProjectileGroup is the thin adapter the ships and
+# game loops hold where they used to hold a bullet sprite group.
+from itertools import repeat
+
+import numpy as np
+
+from settings import WIDTH, HEIGHT
+from atlas import blit_source
+from collision import get_mask, collision_stats
+from particles import round_half_away
+
+# Owners: who fired the projectile, i.e. which ships it can hit
+PLAYER = 0  # Either player in single/cooperative mode
+ENEMY = 1  # Enemies and the boss; slowed by slow motion and culled on all four sides
+PLAYER1 = 2  # Versus mode
+PLAYER2 = 3
+
+
+class Projectiles:
+    def __init__(self, capacity=1024):
+        self.images = []  # Image index -> Surface
+        self.image_ids = {}  # Surface -> image index
+        self.count = 0  # Rows in use; dead rows are packed away on the next update
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        old_count = self.count
+        fields = {
+            'x': np.float64, 'y': np.float64,  # Rect left/top, kept on whole pixels like a Rect
+            'vx': np.float64, 'vy': np.float64,
+            'w': np.int32, 'h': np.int32,
+            'owner': np.int8,
+            'image': np.int16,
+            'alive': np.bool_,
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype)
+            if old_count:
+                array[:old_count] = getattr(self, name)[:old_count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def clear(self):
+        self.count = 0
+        self.images.clear()
+        self.image_ids.clear()
+
+    def group(self, owner):
+        return ProjectileGroup(self, owner)
+
+    def image_index(self, image):
+        index = self.image_ids.get(image)
+        if index is None:
+            index = self.image_ids[image] = len(self.images)
+            self.images.append(image)
+        return index
+
+    def spawn(self, image, vx, vy, owner, **anchor):
+        # anchor is a Rect position keyword (center=, midleft=, ...) placing the image
+        rect = image.get_rect(**anchor)
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        i = self.count
+        self.x[i] = rect.x
+        self.y[i] = rect.y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.w[i] = rect.width
+        self.h[i] = rect.height
+        self.owner[i] = owner
+        self.image[i] = self.image_index(image)
+        self.alive[i] = True
+        self.count += 1
+
+    def compact(self):
+        n = self.count
+        keep = np.flatnonzero(self.alive[:n])
+        if len(keep) == n:
+            return
+        n = len(keep)
+        for array in (self.x, self.y, self.vx, self.vy, self.w, self.h, self.owner, self.image, self.alive):
+            array[:n] = array[keep]
+        self.count = n
+
+    def update(self, speed_multiplier=1.0):
+        """Move every projectile one step and cull the ones that left the screen."""
+        self.compact()
+        n = self.count
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        enemy = self.owner[:n] == ENEMY
+        if speed_multiplier != 1.0:
+            # Only enemy fire is slowed by slow motion
+            scale = np.where(enemy, speed_multiplier, 1.0)
+            x[:] = round_half_away(x + self.vx[:n] * scale)
+            y[:] = round_half_away(y + self.vy[:n] * scale)
+        else:
+            x[:] = round_half_away(x + self.vx[:n])
+            y[:] = round_half_away(y + self.vy[:n])
+
+        # Player shots leave through the sides only; enemy shots through any edge
+        gone = (x > WIDTH) | (x + self.w[:n] < 0)
+        gone |= enemy & ((y + self.h[:n] < 0) | (y > HEIGHT))
+        self.alive[:n] &= ~gone
+
+    def live_indices(self, owner=None):
+        n = self.count
+        if owner is None:
+            return np.flatnonzero(self.alive[:n])
+        return np.flatnonzero(self.alive[:n] & (self.owner[:n] == owner))
+
+    def collide_group(self, owner, group, dokill=False):
+        """Rect hits between `owner`'s projectiles and group, like groupcollide(group, bullets, dokill, True).
+
+        Each projectile is spent on the first sprite (in group order) it overlaps.
+        Returns {sprite: projectiles that hit it}.
+        """
+        crashed = {}
+        index = self.live_indices(owner)
+        if not len(index) or not group:
+            return crashed
+        left = self.x[index]
+        top = self.y[index]
+        right = left + self.w[index]
+        bottom = top + self.h[index]
+        live = np.ones(len(index), np.bool_)
+        for sprite in group.sprites():
+            rect = sprite.rect
+            hit = live & (left < rect.right) & (right > rect.left) & (top < rect.bottom) & (bottom > rect.top)
+            count = int(np.count_nonzero(hit))
+            if count:
+                live &= ~hit
+                self.alive[index[hit]] = False
+                crashed[sprite] = count
+                if dokill:
+                    sprite.kill()
+        return crashed
+
+    def collide_mask(self, owner, sprite):
+        """Pixel-perfect hits between `owner`'s projectiles and sprite; spends and counts them."""
+        index = self.live_indices(owner)
+        if not len(index):
+            return 0
+        rect = sprite.rect
+        left = self.x[index]
+        top = self.y[index]
+        near = (left < rect.right) & (left + self.w[index] > rect.left) & (top < rect.bottom) & (top + self.h[index] > rect.top)
+        candidates = index[near]
+        if not len(candidates):
+            return 0
+
+        # Only the few projectiles overlapping the ship's rect reach the mask test
+        sprite_mask = getattr(sprite, 'mask', None)
+        if sprite_mask is None:
+            sprite_mask = get_mask(sprite.image)
+        collision_stats.current['mask_tests'] += len(candidates)
+        hits = 0
+        for i in candidates.tolist():
+            mask = get_mask(self.images[self.image[i]])
+            if sprite_mask.overlap(mask, (int(self.x[i]) - rect.x, int(self.y[i]) - rect.y)):
+                self.alive[i] = False
+                hits += 1
+        return hits
+
+    def draw(self, surface, doreturn=False):
+        # doreturn: return the Rects drawn, for dirty rect rendering
+        rects = [] if doreturn else None
+        index = self.live_indices()
+        if not len(index):
+            return rects
+        # One blits call per image (there are only a handful), so no per-bullet image lookup
+        image_index = self.image[index]
+        for i, image in enumerate(self.images):
+            rows = index[image_index == i]
+            if len(rows):
+                # Atlas views blit from their sheet, which is cheaper per blit than a subsurface
+                source, area = blit_source(image)
+                positions = zip(self.x[rows].tolist(), self.y[rows].tolist())
+                drawn = surface.blits(zip(repeat(source), positions, repeat(area)), doreturn=doreturn)
+                if doreturn:
+                    rects.extend(drawn)
+        return rects
+
+
+class ProjectileGroup:
+    """One owner's view of a Projectiles store, held where a bullet sprite group used to be."""
+
+    def __init__(self, projectiles, owner):
+        self.projectiles = projectiles
+        self.owner = owner
+
+    def __len__(self):
+        return len(self.projectiles.live_indices(self.owner))
+
+    def fire(self, image, speedx, speedy=0, **anchor):
+        self.projectiles.spawn(image, speedx, speedy, self.owner, **anchor)
+
+    def collide_group(self, group, dokill=False):
+        return self.projectiles.collide_group(self.owner, group, dokill)
+
+    def collide_mask(self, sprite):
+        return self.projectiles.collide_mask(self.owner, sprite)
@@ -0,0 +1,96 @@
+# render.py
+# Frame presentation for the game loops. In the default mode every frame
+# repaints the scrolling background and flips the whole display. In dirty
+# rect mode (DIRTY_RECTS in settings) the background stays still: each frame
+# only erases what was drawn the frame before, and display.update() pushes
+# just those regions and the new ones, which saves fill rate on slow hardware.
+import pygame
+
+from profiler import profiler
+from settings import WIDTH, HEIGHT, DIRTY_RECTS
+
+BLACK = (0, 0, 0)
+
+
+class Renderer:
+    def __init__(self, screen, background, dirty=DIRTY_RECTS, headless=False):
+        self.screen = screen
+        self.background = background
+        self.dirty = dirty
+        self.headless = headless  # Draw offscreen only, never touch the display
+        self.strip = None  # Black fill + the background at 0 and WIDTH, composed once into one opaque surface
+        self.backdrop = None  # Dirty mode: the empty screen (fill + background), built on first use
+        self.drawn = []  # Rects drawn this frame
+        self.previous = []  # Rects drawn last frame, erased at the start of this one
+        self.full_update = True  # Next frame repaints and pushes the whole screen
+
+    def invalidate(self):
+        # Something else drew over the screen (pause overlay, menus); start the next frame from scratch
+        self.full_update = True
+
+    def build_strip(self):
+        # The background scrolls left by up to WIDTH, so two screens of it cover every offset. Composing
+        # the fill and both blits once turns each frame's background into one opaque copy, no blending
+        width = min(2 * WIDTH, self.background.get_width() + WIDTH)
+        strip = pygame.Surface((width, max(HEIGHT, self.background.get_height()))).convert()
+        strip.fill(BLACK)
+        strip.blit(self.background, (0, 0))
+        strip.blit(self.background, (WIDTH, 0))
+        return strip
+
+    def paint_background(self, background_x=0):
+        # Draw the game background with parallax effect
+        if self.strip is None:
+            self.strip = self.build_strip()
+        self.screen.blit(self.strip, (background_x, 0))
+
+    def begin(self, background_x=0):
+        screen = self.screen
+        if not self.dirty:
+            self.paint_background(background_x)
+            return
+
+        if self.backdrop is None:
+            self.backdrop = pygame.Surface((WIDTH, HEIGHT)).convert()
+            self.backdrop.blit(self.build_strip(), (0, 0))
+        if self.full_update:
+            screen.blit(self.backdrop, (0, 0))
+        else:
+            backdrop = self.backdrop
+            screen.blits([(backdrop, rect, rect) for rect in self.previous], doreturn=False)
+
+    def mark(self, rects):
+        # Record what a draw call touched; accepts a Rect, a list of Rects or None
+        if not self.dirty or rects is None:
+            return
+        if isinstance(rects, pygame.Rect):
+            self.drawn.append(rects)
+        else:
+            self.drawn.extend(rects)
+
+    def draw_group(self, group):
+        # Group.draw() only returns the rects of removed sprites, so the drawn ones come from spritedict
+        group.draw(self.screen)
+        if self.dirty:
+            self.drawn.extend(group.spritedict.values())
+
+    def blit(self, surface, dest):
+        rect = self.screen.blit(surface, dest)
+        if self.dirty:
+            self.drawn.append(rect)
+        return rect
+
+    def present(self):
+        profiler.mark('draw')  # Everything up to here drew the frame
+        self.mark(profiler.draw_overlay(self.screen))
+        profiler.mark('overlay')
+        if not self.headless:
+            if not self.dirty or self.full_update:
+                pygame.display.flip()
+            else:
+                # Last frame's rects are where this frame erased, the new ones where it drew
+                pygame.display.update(self.previous + self.drawn)
+        profiler.mark('flip')
+        self.full_update = False
+        self.previous = self.drawn
+        self.drawn = []
@@ -5,3 +5,52 @@ WIDTH = 600
 HEIGHT = 880
 
 FULLSCREEN = False
+
+# Homing rockets keep their target until it dies instead of re-picking the nearest one every frame
+ROCKET_TARGET_LOCK = False
+
+# Most idle instances each sprite pool (explosions) keeps for reuse
+POOL_SIZE = 512
+
+# Cached rotations snap to buckets of this many degrees (0 keeps exact angles, with few cache hits)
+ROTATION_STEP = 4
+# Memory cap of the shared rotate/flip/scale cache, least recently used results go first
+TRANSFORM_CACHE_MB = 64
+# Asteroid sizes are rounded to this many pixels so asteroids of similar size share rotated frames
+ASTEROID_SIZE_STEP = 10
+
+# Stars per parallax layer in game and versus mode, and in the main menu
+STARS_PER_LAYER = 50
+MENU_STARS = 50
+MENU_TWINKLING_STARS = 100
+# Star opacities are rounded to this step so stars share pre-rendered stamps
+STAR_ALPHA_STEP = 8
+
+# Redraw and push only the screen regions that changed each frame, over a still background,
+# instead of repainting and flipping the whole display (for fill-rate bound hardware)
+DIRTY_RECTS = False
+
+# Keep loaded images as ready-to-use pixels in a packed cache file, so later starts skip PNG decoding
+ASSET_CACHE = True
+ASSET_CACHE_PATH = 'cache/assets.pack'
+# Worker threads decoding images and sounds while the menu runs
+ASSET_LOAD_THREADS = 4
+# Widest the sprite atlas sheet may grow; sprites are packed on shelves up to this width
+ATLAS_WIDTH = 1024
+
+# Record per-phase frame times from startup (F3 toggles it and its overlay, F4 exports the timeline)
+PROFILER = False
+# Frames kept for the profiler's rolling percentiles and export
+PROFILER_FRAMES = 600
+PROFILER_EXPORT_DIR = 'profiles'
+
+# Keep the last few seconds of frame times, entity counts, game events and garbage collections,
+# and write them to disk when a frame takes longer than the budget; cheap enough to leave on
+HITCH_RECORDER = True
+HITCH_BUDGET_MS = 50
+# Frames kept in the ring buffer (5 seconds at 60 fps), and frames after a hitch before it is dumped
+HITCH_FRAMES = 300
+HITCH_FRAMES_AFTER = 60
+HITCH_DUMP_DIR = 'hitches'
+# Dumps written per run at most, so a machine that is always slow doesn't fill the disk
+HITCH_MAX_DUMPS = 20
@@ -0,0 +1,70 @@
+# sim_clock.py
+# Fixed-timestep simulation clock. Every entity timer reads this clock instead
+# of pygame.time.get_ticks(), so gameplay advances by exactly STEP_MS per tick
+# whether frames are rendered live, accelerated or headless.
+
+STEP_MS = 1000 / 60  # One simulation step at 60 ticks per second
+MAX_STEPS_PER_FRAME = 5  # Cap on catch-up steps after a slow frame
+
+
+class SimClock:
+    def __init__(self, step_ms=STEP_MS, max_steps=MAX_STEPS_PER_FRAME):
+        self.step_ms = step_ms
+        self.max_steps = max_steps
+        self.reset()
+
+    def reset(self):
+        """Start a fresh simulation at time 0 with no timers and not paused."""
+        self.steps = 0
+        self.paused = False
+        self.accumulator = 0.0
+        self.timers = {}  # event type -> [interval, next due time]
+
+    def get_ticks(self):
+        # Simulation time in milliseconds, the drop-in for pygame.time.get_ticks()
+        return self.steps * self.step_ms
+
+    def set_timer(self, event_type, interval):
+        # Same contract as pygame.time.set_timer: a zero interval cancels the timer
+        if interval <= 0:
+            self.timers.pop(event_type, None)
+        else:
+            self.timers[event_type] = [interval, self.get_ticks() + interval]
+
+    def tick(self):
+        """Advance one step and return the timer events that became due."""
+        self.steps += 1
+        now = self.get_ticks()
+        fired = []
+        for event_type, timer in self.timers.items():
+            if now >= timer[1]:
+                fired.append(event_type)
+                timer[1] += timer[0]
+        return fired
+
+    def steps_for(self, elapsed_ms):
+        """Number of steps to run so the simulation catches up with elapsed_ms of real time."""
+        if self.paused:
+            self.accumulator = 0.0
+            return 0
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            # Too far behind (debugger, window drag): drop the backlog instead of spiralling
+            self.accumulator = 0.0
+            return self.max_steps
+        self.accumulator -= steps * self.step_ms
+        return steps
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+
+# Shared clock read by game_classes and driven by the game loops
+sim_clock = SimClock()
@@ -0,0 +1,129 @@
+# starfield.py
+# Background stars kept in NumPy arrays and drawn from a cache of
+# pre-rendered stamps, one per (size, colour, opacity bucket), so a whole
+# starfield is a single Surface.blits call however many stars it holds.
+import random
+
+import numpy as np
+import pygame
+
+from settings import WIDTH, HEIGHT, STAR_ALPHA_STEP, STARS_PER_LAYER
+
+WHITE = (255, 255, 255)
+
+
+class Starfield:
+    def __init__(self, capacity=256, box_scale=2.0, alpha_step=STAR_ALPHA_STEP):
+        self.box_scale = box_scale  # Stamp side as a multiple of the star radius; below 2 clips the circle
+        self.alpha_step = alpha_step  # Opacities are rounded to this step to share stamps
+        self.palette = []  # Colour index -> RGB
+        self.colors = {}  # RGB -> colour index
+        self.stamps = {}  # (size, colour index, alpha) -> Surface
+        self.count = 0
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        old_count = self.count
+        fields = {
+            'x': np.float64, 'y': np.float64,
+            'speed': np.float64,  # Pixels per step to the left; 0 for fixed stars
+            'size': np.int16,
+            'color': np.int16,
+            'opacity': np.float64, 'max_opacity': np.float64,
+            'fade_speed': np.float64,  # Opacity change per step for twinkling stars; 0 for steady ones
+            'fading': np.bool_,
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype)
+            if old_count:
+                array[:old_count] = getattr(self, name)[:old_count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def add(self, x, y, speed=0.0, size=1, opacity=255, color=WHITE, fade_speed=0.0, fading=False):
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        color_index = self.colors.get(color)
+        if color_index is None:
+            color_index = self.colors[color] = len(self.palette)
+            self.palette.append(color)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = speed
+        self.size[i] = size
+        self.color[i] = color_index
+        self.opacity[i] = self.max_opacity[i] = opacity
+        self.fade_speed[i] = fade_speed
+        self.fading[i] = fading
+        self.count += 1
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        # Parallax scroll; stars leaving on the left come back on the right at a random height
+        x = self.x[:n]
+        x -= self.speed[:n]
+        wrapped = np.flatnonzero(x < 0)
+        if len(wrapped):
+            x[wrapped] = WIDTH
+            self.y[wrapped] = [random.randint(0, HEIGHT) for _ in range(len(wrapped))]
+
+        # Twinkle: fade down to 0, then back up to the star's starting opacity
+        fade_speed = self.fade_speed[:n]
+        if fade_speed.any():
+            opacity = self.opacity[:n]
+            fading = self.fading[:n]
+            max_opacity = self.max_opacity[:n]
+            opacity += np.where(fading, -fade_speed, fade_speed)
+            out = fading & (opacity <= 0)
+            opacity[out] = 0
+            back = ~fading & (opacity >= max_opacity)
+            opacity[back] = max_opacity[back]
+            fading[out | back] ^= True
+
+    def stamp(self, size, color_index, alpha):
+        side = int(size * self.box_scale)
+        stamp = pygame.Surface((side, side), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, (*self.palette[color_index], alpha), (size, size), size)
+        return stamp
+
+    def draw(self, surface, doreturn=False):
+        # doreturn: return the Rects drawn, for dirty rect rendering
+        n = self.count
+        if not n:
+            return [] if doreturn else None
+        step = self.alpha_step
+        alphas = np.clip(np.rint(self.opacity[:n] / step) * step, 0, 255).astype(np.int64)
+        colors = len(self.palette)
+        codes = (self.size[:n].astype(np.int64) * colors + self.color[:n]) * 256 + alphas
+        # Only the distinct stamps in use are looked up; each star then just indexes that short list
+        unique, inverse = np.unique(codes, return_inverse=True)
+        stamps = []
+        for code in unique.tolist():
+            key = (code // 256 // colors, code // 256 % colors, code % 256)
+            stamp = self.stamps.get(key)
+            if stamp is None:
+                stamp = self.stamps[key] = self.stamp(*key)
+            stamps.append(stamp)
+        positions = zip(self.x[:n].astype(np.int32).tolist(), self.y[:n].astype(np.int32).tolist())
+        return surface.blits(zip(map(stamps.__getitem__, inverse.tolist()), positions), doreturn=doreturn)
+
+
+def parallax_starfield(layers=3, per_layer=STARS_PER_LAYER):
+    """The in-game background: `layers` layers of white stars, each faster than the last."""
+    field = Starfield(layers * per_layer)
+    for i in range(layers):
+        for _ in range(per_layer):
+            field.add(
+                random.randint(0, WIDTH),
+                random.randint(0, HEIGHT),
+                speed=random.uniform(0.1 * (i + 1), 1.1 * (i + 1)),
+                size=random.randint(1, 2),
+                opacity=random.randint(30, 100),
+            )
+    return field
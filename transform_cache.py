@@ -0,0 +1,84 @@
+# transform_cache.py
+# Shared memo for pygame.transform results. Rotations are snapped to angle
+# buckets so sprites turning through the same angles reuse one surface, and
+# the least recently used entries are evicted once the cache outgrows its
+# memory cap. Cached surfaces are shared: callers must never draw on them.
+from collections import OrderedDict
+
+import pygame
+
+from settings import ROTATION_STEP, TRANSFORM_CACHE_MB
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class TransformCache:
+    def __init__(self, max_bytes=TRANSFORM_CACHE_MB * 1024 * 1024, rotation_step=ROTATION_STEP):
+        self.max_bytes = max_bytes
+        self.rotation_step = rotation_step  # Degrees per rotation bucket; 0 caches every exact angle
+        self.entries = OrderedDict()  # (source, operation, parameters) -> surface, oldest first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def lookup(self, key, build):
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self.entries[key] = build()
+        self.bytes += surface_bytes(surface)
+        # Keep at least the entry just built, however large it is
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    def discard(self, sources):
+        # Forget every transform of these source images, e.g. when their assets are unloaded
+        sources = set(sources)
+        for key in [key for key in self.entries if key[0] in sources]:
+            self.bytes -= surface_bytes(self.entries.pop(key))
+
+    def quantize_angle(self, angle):
+        step = self.rotation_step
+        if step:
+            angle = round(angle / step) * step
+        return angle % 360
+
+    def rotate(self, image, angle):
+        angle = self.quantize_angle(angle)
+        return self.lookup((image, 'rotate', angle), lambda: pygame.transform.rotate(image, angle))
+
+    def flip(self, image, flip_x, flip_y):
+        return self.lookup((image, 'flip', bool(flip_x), bool(flip_y)), lambda: pygame.transform.flip(image, flip_x, flip_y))
+
+    def scale(self, image, size, step=1):
+        # step > 1 rounds the size to that many pixels so near sizes share one surface
+        width, height = (max(step, round(side / step) * step) for side in size)
+        return self.lookup((image, 'scale', width, height), lambda: pygame.transform.scale(image, (width, height)))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'evictions': self.evictions,
+        }
+
+
+# Shared by every sprite, so equal transforms of the same image are built once
+transform_cache = TransformCache()
@@ -1,369 +1,373 @@
 import pygame
 import random
 import sys
-from game_classes import Player, Explosion, Star
-from game_assets import load_assets
-from settings import WIDTH, HEIGHT, FULLSCREEN  # Import screen dimensions from settings
+from game_classes import Player, explosion_pool
+from game_assets import assets
+from loading_screen import loading_screen
+from sim_clock import sim_clock
+from profiler import profiler
+from hitch import hitches
+from collision import collision_stats
+from projectiles import Projectiles, PLAYER1, PLAYER2
+from starfield import parallax_starfield
+from render import Renderer
+from fonts import fonts
+from hud import Hud
+from transform_cache import transform_cache
+from settings import WIDTH, HEIGHT  # Import screen dimensions from settings
 from pause_menu import PauseMenu  # Import the PauseMenu
 from gameover_menu import GameOverMenu  # Import the new GameOverMenu
 
-click_sound = pygame.mixer.Sound('assets/sounds/click.wav')  # Add your click sound file
-hover_sound = pygame.mixer.Sound('assets/sounds/hover.wav')  # Add your hover sound file
-
-# Initialize Pygame modules
-pygame.init()
-pygame.font.init()  # Ensure font module is initialized
-
-# Screen dimensions
-# Set screen mode based on FULLSCREEN flag
-if FULLSCREEN:
-    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)  # Full-screen mode
-else:
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))  # Windowed mode
-    
-# Bullet class specific to versus mode
-class BulletVersus(pygame.sprite.Sprite):
-    def __init__(self, x, y, image, speedx):
-        super().__init__()
-        self.image = image
-        self.rect = self.image.get_rect()
-        if speedx > 0:
-            self.rect.left = x
-        else:
-            self.rect.right = x
-        self.rect.centery = y
-        self.speedx = speedx
-
-    def update(self):
-        self.rect.x += self.speedx
-        if self.rect.left > WIDTH or self.rect.right < 0:
-            self.kill()
-
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 
-assets = load_assets()
-
-# Fonts
-game_font = pygame.font.Font(None, 36)  # Default font
 
-def versus_loop():
-    pygame.mixer.music.load('assets/sounds/versus_music.mp3')
-    pygame.mixer.music.play(-1)  # Loop the music indefinitely
+class VersusScene:
+    """Versus: first player to score_limit kills wins, then the game over menu. ESC pauses."""
 
-    # Scores
     score_limit = 10
-    player1_score = 0
-    player2_score = 0
-
-    all_sprites = pygame.sprite.Group()
-    bullets_p1 = pygame.sprite.Group()
-    bullets_p2 = pygame.sprite.Group()
-
-    # Create multiple layers of stars for parallax effect
-    star_layers = []
-    for i in range(3):
-        star_layer = [
-            Star(
-                random.randint(0, WIDTH),
-                random.randint(0, HEIGHT),
-                random.uniform(0.1 * (i + 1), 1.1 * (i + 1)),
-                random.randint(1, 2),
-                random.randint(30, 100),
-            )
-            for _ in range(50)
-        ]
-        star_layers.append(star_layer)
-
-    # Define controls for both players
-    player1_controls = {
-        'up': pygame.K_w,
-        'down': pygame.K_s,
-        'left': pygame.K_a,
-        'right': pygame.K_d,
-        'shoot': pygame.K_SPACE,
-        'speed': pygame.K_LSHIFT,
-    }
-
-    player2_controls = {
-        'up': pygame.K_UP,
-        'down': pygame.K_DOWN,
-        'left': pygame.K_LEFT,
-        'right': pygame.K_RIGHT,
-        'shoot': pygame.K_RETURN,
-        'speed': pygame.K_KP0,  # Numpad 0
-    }
-
-    def spawn_player1():
+
+    def __init__(self, headless=False, render=True):
+        # headless: one fixed step per frame and nothing sent to the display; render: draw frames at all
+        self.headless = headless
+        self.render = render
+
+    def enter(self):
+        screen = self.screen = pygame.display.get_surface()
+        # Load whatever the menu didn't preload now, not mid-game at first use
+        loading = assets.preload('versus', background=True)
+        if self.headless:
+            loading.wait()
+        else:
+            loading_screen(screen, loading)
+        self.click_sound = assets['click_sound']
+        self.hover_sound = assets['hover_sound']
+        pygame.mixer.music.load('assets/sounds/versus_music.mp3')
+        pygame.mixer.music.play(-1)  # Loop the music indefinitely
+
+        sim_clock.reset()  # Every entity timer below starts from simulation time 0
+
+        # Scores
+        self.player1_score = 0
+        self.player2_score = 0
+
+        self.all_sprites = pygame.sprite.Group()
+
+        # Each player's bullets, kept in NumPy arrays rather than sprite groups
+        self.projectiles = Projectiles()
+        self.bullets_p1 = self.projectiles.group(PLAYER1)
+        self.bullets_p2 = self.projectiles.group(PLAYER2)
+
+        # Create multiple layers of stars for parallax effect
+        self.stars = parallax_starfield()
+
+        # Define controls for both players
+        self.player1_controls = {
+            'up': pygame.K_w,
+            'down': pygame.K_s,
+            'left': pygame.K_a,
+            'right': pygame.K_d,
+            'shoot': pygame.K_SPACE,
+            'speed': pygame.K_LSHIFT,
+        }
+
+        self.player2_controls = {
+            'up': pygame.K_UP,
+            'down': pygame.K_DOWN,
+            'left': pygame.K_LEFT,
+            'right': pygame.K_RIGHT,
+            'shoot': pygame.K_RETURN,
+            'speed': pygame.K_KP0,  # Numpad 0
+        }
+
+        # Initialize empty groups for rockets and targets
+        empty_rockets_group = pygame.sprite.Group()
+        empty_targets_group = pygame.sprite.Group()
+
+        # Player 1 setup
+        self.player1 = Player(
+            assets['player1_img'],
+            assets['player1_thruster_frames'],
+            self.bullets_p1,
+            empty_rockets_group,
+            self.all_sprites,
+            empty_targets_group,
+            assets,
+            self.player1_controls,
+            facing_left=False,
+            ship_frames=assets['player1_frames'],
+        )
+        self.spawn_player1()
+
+        # Player 2 setup (facing left)
+        player2_image = transform_cache.flip(assets['player2_img'], True, False)
+        player2_thrusters = assets['player2_thruster_frames']
+        self.player2 = Player(
+            player2_image,
+            player2_thrusters,
+            self.bullets_p2,
+            empty_rockets_group,
+            self.all_sprites,
+            empty_targets_group,
+            assets,
+            self.player2_controls,
+            facing_left=True,
+            ship_frames=assets['player2_frames_left'],
+        )
+        self.spawn_player2()
+
+        self.all_sprites.add(self.player1)
+        self.all_sprites.add(self.player2)
+
+        # Background image
+        self.background_x = 0  # For parallax effect
+
+        self.winner = None
+        self.respawn_timer_p1 = None
+        self.respawn_timer_p2 = None
+
+        self.renderer = Renderer(screen, assets['versus_background'], headless=self.headless)
+
+        # Scores are rendered again only when they change
+        game_font = fonts.font(36)  # Default font
+        self.hud = Hud()
+        self.hud.add('p1_score', game_font, "P1 Score: {}", self.player1_score, topleft=(10, 10))
+        self.hud.add('p2_score', game_font, "P2 Score: {}", self.player2_score, topright=(WIDTH - 10, 10))
+
+        # Initialize the pause menu
+        self.pause_menu = PauseMenu(screen, self.click_sound, self.hover_sound, self.renderer)
+        self.gameover_menu = None  # Shown once somebody wins
+
+    def exit(self):
+        # Kill every sprite so pooled explosions go back to their pool and no group keeps the match alive
+        for sprite in self.all_sprites.sprites():
+            sprite.kill()
+        sim_clock.reset()
+
+    def entity_counts(self):
+        # Per-group sizes for the profiler
+        return {'sprites': len(self.all_sprites), 'bullets': len(self.projectiles)}
+
+    def spawn_player1(self):
         x = random.randint(50, WIDTH // 2 - 50)
         y = random.randint(50, HEIGHT - 50)
-        player1.rect.left = x
-        player1.rect.centery = y
+        self.player1.rect.left = x
+        self.player1.rect.centery = y
 
-    def spawn_player2():
+    def spawn_player2(self):
         x = random.randint(WIDTH // 2 + 50, WIDTH - 50)
         y = random.randint(50, HEIGHT - 50)
-        player2.rect.right = x
-        player2.rect.centery = y
-
-    # Initialize empty groups for rockets and targets
-    empty_rockets_group = pygame.sprite.Group()
-    empty_targets_group = pygame.sprite.Group()
-
-    # Player 1 setup
-    player1 = Player(
-        assets['player1_img'],
-        assets['player1_thruster_frames'],
-        bullets_p1,
-        empty_rockets_group,
-        all_sprites,
-        empty_targets_group,
-        assets,
-        player1_controls,
-        facing_left=False
-    )
-    spawn_player1()
-
-    # Player 2 setup (facing left)
-    player2_image = pygame.transform.flip(assets['player2_img'], True, False)
-    player2_thrusters = assets['player2_thruster_frames']
-    player2 = Player(
-        player2_image,
-        player2_thrusters,
-        bullets_p2,
-        empty_rockets_group,
-        all_sprites,
-        empty_targets_group,
-        assets,
-        player2_controls,
-        facing_left=True
-    )
-    spawn_player2()
-
-    all_sprites.add(player1)
-    all_sprites.add(player2)
-
-    # Background image
-    background = assets['versus_background']
-    background_x = 0  # For parallax effect
-
-    running = True
-    paused = False
-    game_over = False
-    winner = None
-    respawn_timer_p1 = None
-    respawn_timer_p2 = None
-
-    # Initialize the pause menu
-    pause_menu = PauseMenu(screen, click_sound, hover_sound)
-
-    def unpause_sprites():
-        """ Unpauses all sprites and restores their movement and action. """
-        for sprite in all_sprites:
-            if hasattr(sprite, 'pause') and sprite.paused:  # Check if the sprite is paused
-                sprite.pause()  # Unpause the sprite
-
-    while running:
-        pygame.time.Clock().tick(60)
-
-        if paused:
-            # Draw game elements first (stars, players, bullets, etc.) so they are visible behind the pause menu
-            screen.fill(BLACK)
-
-            # Draw the game background with parallax effect
-            screen.blit(background, (background_x, 0))
-            screen.blit(background, (background_x + WIDTH, 0))
-
-            # Draw star layers for parallax effect
-            for layer in star_layers:
-                for star in layer:
-                    star.draw(screen)
-
-            all_sprites.draw(screen)
-
-            # Draw scores
-            score_text_p1 = game_font.render(f"P1 Score: {player1_score}", True, WHITE)
-            score_text_p2 = game_font.render(f"P2 Score: {player2_score}", True, WHITE)
-            screen.blit(score_text_p1, (10, 10))
-            screen.blit(score_text_p2, (WIDTH - score_text_p2.get_width() - 10, 10))
+        self.player2.rect.right = x
+        self.player2.rect.centery = y
+
+    def update(self, events, elapsed_ms=None):
+        """Advance one frame; returns the name of the scene to switch to, or None to stay."""
+        if self.winner:
+            if self.gameover_menu is None:
+                # The winning frame is on screen; the Game Over Menu takes over from this one
+                self.gameover_menu = GameOverMenu(self.screen, self.winner, self.click_sound, self.hover_sound, self.renderer)
+            # Handle mouse and keyboard events for the Game Over menu
+            mouse_pos = pygame.mouse.get_pos()
+            self.gameover_menu.update(mouse_pos)
+            for event in events:
+                result = self.gameover_menu.handle_mouse_event(event, mouse_pos) or self.gameover_menu.handle_event(event)
+                if result == "retry":
+                    return 'versus'  # A fresh match
+                elif result == "main_menu":
+                    return 'menu'
+            return None
+
+        if self.headless:
+            steps = 1  # One fixed step per frame, as fast as the CPU allows
+        else:
+            # Run as many fixed steps as real time demands, catching up after a slow frame
+            steps = sim_clock.steps_for(elapsed_ms)
 
+        if sim_clock.paused:
             # Handle pause menu interactions while the game is paused
             mouse_pos = pygame.mouse.get_pos()
-            pause_menu.update(mouse_pos)
-            pause_menu.draw()  # Draw the pause menu with the transparent overlay on top of the game
+            self.pause_menu.update(mouse_pos)
 
             # Handle pause menu events in one place
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                result = pause_menu.handle_mouse_event(event, mouse_pos) or pause_menu.handle_event(event)
+            for event in events:
+                result = self.pause_menu.handle_mouse_event(event, mouse_pos) or self.pause_menu.handle_event(event)
                 if result == "resume":
-                    paused = False
-                    unpause_sprites()  # Unpause the sprites when resuming
+                    sim_clock.resume()
+                    self.pause_menu.close()
                 elif result == "main_menu":
-                    from menu import main_menu
-                    main_menu()  # Go back to the main menu
-                    return  # Exit the current game loop
+                    return 'menu'  # Go back to the main menu
 
-            # Skip the rest of the loop while paused
-            pygame.display.flip()
-            continue
+            # Skip the game logic while paused
+            return None
 
         # Event handling when game is not paused
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-
+        for event in events:
             # Toggle pause state
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                paused = True  # Set paused state to true
-                for sprite in all_sprites:
-                    if hasattr(sprite, 'pause'):
-                        sprite.pause()
+                sim_clock.pause()
+        profiler.mark('events')
+
+        all_sprites = self.all_sprites
+        player1, player2 = self.player1, self.player2
+        # Game logic, one pass per simulation step
+        for _ in range(steps):
+            sim_clock.tick()
 
-        # Game logic when not paused
-        if not paused:
             # Update background position for parallax effect
-            background_x -= 0.1  # Adjust speed as needed
-            if background_x <= -WIDTH:
-                background_x = 0
+            self.background_x -= 0.1  # Adjust speed as needed
+            if self.background_x <= -WIDTH:
+                self.background_x = 0
 
+            self.projectiles.update()  # Before the players fire, so new bullets first move next step
             all_sprites.update()
+            profiler.mark('update')
 
             # Update stars
-            for layer in star_layers:
-                for star in layer:
-                    star.update()
+            self.stars.update()
+            profiler.mark('stars')
 
             # Handle shooting for Player 1
-            now = pygame.time.get_ticks()
+            now = sim_clock.get_ticks()
             keys = pygame.key.get_pressed()
             if player1.alive:
-                if keys[player1_controls['shoot']]:
+                if keys[self.player1_controls['shoot']]:
                     if now - player1.last_shot > player1.shoot_delay:
-                        bullet = BulletVersus(
-                            player1.rect.right,
-                            player1.rect.centery,
-                            assets['bullet_img'],
-                            player1.bullet_speedx  # Bullet speed
+                        self.bullets_p1.fire(
+                            player1.bullet_img,
+                            player1.bullet_speedx,  # Bullet speed
+                            midleft=(player1.rect.right, player1.rect.centery),
                         )
-                        bullets_p1.add(bullet)
-                        all_sprites.add(bullet)
                         player1.last_shot = now
                         assets['gun_sound'].play()
 
             # Handle shooting for Player 2
             if player2.alive:
-                if keys[player2_controls['shoot']]:
+                if keys[self.player2_controls['shoot']]:
                     if now - player2.last_shot > player2.shoot_delay:
-                        bullet = BulletVersus(
-                            player2.rect.left,
-                            player2.rect.centery,
-                            pygame.transform.flip(assets['bullet_img'], True, False),
-                            player2.bullet_speedx  # Bullet speed
+                        self.bullets_p2.fire(
+                            player2.bullet_img,  # Already flipped to face left
+                            player2.bullet_speedx,  # Bullet speed
+                            midright=(player2.rect.left, player2.rect.centery),
                         )
-                        bullets_p2.add(bullet)
-                        all_sprites.add(bullet)
                         player2.last_shot = now
                         assets['gun_sound'].play()
+            profiler.mark('update')  # Firing counts with the rest of the update
 
             # Handle collisions between bullets and players
             if player1.alive:
-                hits = pygame.sprite.spritecollide(player1, bullets_p2, True, pygame.sprite.collide_mask)
+                hits = self.bullets_p2.collide_mask(player1)
                 if hits:
-                    explosion = Explosion(player1.rect.center, assets['explosion_spritesheet'])
+                    explosion = explosion_pool.acquire(player1.rect.center, assets['explosion_frames']['normal'])
                     all_sprites.add(explosion)
                     assets['explosion_sound'].play()
                     player1.alive = False
                     all_sprites.remove(player1)
-                    player2_score += 1
-                    respawn_timer_p1 = pygame.time.get_ticks() + 1000  # 1 seconds
+                    self.player2_score += 1
+                    self.respawn_timer_p1 = sim_clock.get_ticks() + 1000  # 1 seconds
+                    hitches.event('death', 'player1')
                     assets['player2_kill_sound'].play()
 
             if player2.alive:
-                hits = pygame.sprite.spritecollide(player2, bullets_p1, True, pygame.sprite.collide_mask)
+                hits = self.bullets_p1.collide_mask(player2)
                 if hits:
-                    explosion = Explosion(player2.rect.center, assets['explosion_spritesheet'])
+                    explosion = explosion_pool.acquire(player2.rect.center, assets['explosion_frames']['normal'])
                     all_sprites.add(explosion)
                     assets['explosion_sound'].play()
                     player2.alive = False
                     all_sprites.remove(player2)
-                    player1_score += 1
-                    respawn_timer_p2 = pygame.time.get_ticks() + 1000  # 1 seconds
+                    self.player1_score += 1
+                    self.respawn_timer_p2 = sim_clock.get_ticks() + 1000  # 1 seconds
+                    hitches.event('death', 'player2')
                     assets['player1_kill_sound'].play()
 
+            collision_stats.end_frame()  # Close this step's narrow-phase counters
+            profiler.mark('collisions')
+
             # Respawn players
-            if not player1.alive and respawn_timer_p1 and pygame.time.get_ticks() > respawn_timer_p1:
-                spawn_player1()
+            if not player1.alive and self.respawn_timer_p1 and sim_clock.get_ticks() > self.respawn_timer_p1:
+                self.spawn_player1()
                 player1.alive = True
                 all_sprites.add(player1)
-                respawn_timer_p1 = None
+                self.respawn_timer_p1 = None
+                hitches.event('spawn', 'player1')
 
-            if not player2.alive and respawn_timer_p2 and pygame.time.get_ticks() > respawn_timer_p2:
-                spawn_player2()
+            if not player2.alive and self.respawn_timer_p2 and sim_clock.get_ticks() > self.respawn_timer_p2:
+                self.spawn_player2()
                 player2.alive = True
                 all_sprites.add(player2)
-                respawn_timer_p2 = None
+                self.respawn_timer_p2 = None
+                hitches.event('spawn', 'player2')
 
             # Check for winner
-            if player1_score >= score_limit:
-                game_over = True
-                winner = "Player 1"
-            elif player2_score >= score_limit:
-                game_over = True
-                winner = "Player 2"
-
-        # Draw everything
-        screen.fill(BLACK)
-
-        # Draw the game background with parallax effect
-        screen.blit(background, (background_x, 0))
-        screen.blit(background, (background_x + WIDTH, 0))
+            if self.player1_score >= self.score_limit:
+                self.winner = "Player 1"
+            elif self.player2_score >= self.score_limit:
+                self.winner = "Player 2"
+            if self.winner:
+                break
+        return None
+
+    def draw_scene(self):
+        screen = self.screen
+        renderer = self.renderer
+        # Background (or, rendering dirty rects, just last frame's rects erased), then everything on it
+        renderer.begin(self.background_x)
 
         # Draw star layers for parallax effect
-        for layer in star_layers:
-            for star in layer:
-                star.draw(screen)
+        renderer.mark(self.stars.draw(screen, renderer.dirty))
 
-        all_sprites.draw(screen)
+        renderer.draw_group(self.all_sprites)
+        renderer.mark(self.projectiles.draw(screen, renderer.dirty))
 
         # Draw scores
-        score_text_p1 = game_font.render(f"P1 Score: {player1_score}", True, WHITE)
-        score_text_p2 = game_font.render(f"P2 Score: {player2_score}", True, WHITE)
-        screen.blit(score_text_p1, (10, 10))
-        screen.blit(score_text_p2, (WIDTH - score_text_p2.get_width() - 10, 10))
-
-        pygame.display.flip()
+        self.hud.set('p1_score', self.player1_score)
+        self.hud.set('p2_score', self.player2_score)
+        renderer.mark(self.hud.draw(screen))
+
+    def draw(self):
+        if not self.render:
+            return
+        if self.gameover_menu is not None:
+            self.gameover_menu.draw()
+        elif sim_clock.paused:
+            if self.pause_menu.backdrop is None:
+                # Draw game elements first (stars, players, bullets, etc.) so they are visible behind the pause menu
+                self.draw_scene()
+            self.pause_menu.draw()  # Draw the pause menu with the transparent overlay on top of the game
+        else:
+            self.draw_scene()
+            self.renderer.present()
 
-        if game_over:
-            break
 
-    # Show the Game Over Menu
-    gameover_menu = GameOverMenu(screen, winner, click_sound, hover_sound)
+def versus_loop(headless=False, max_frames=None, render=True):
+    """Play one match outside the scene manager, up to its winning frame, and return its frame count.
 
+    headless: skip display.flip and the frame cap; max_frames: stop after this many frames;
+    render: draw the frame even when headless.
+    """
+    scene = VersusScene(headless=headless, render=render)
+    scene.enter()
+    clock = pygame.time.Clock()
+    frame_count = 0
     while True:
-        mouse_pos = pygame.mouse.get_pos()
-
-        gameover_menu.update(mouse_pos)
-        gameover_menu.draw()
-
-        # Handle mouse and keyboard events for the Game Over menu
-        for event in pygame.event.get():
+        elapsed_ms = None if headless else clock.tick(60)
+        frame_count += 1
+        profiler.begin_frame('versus')
+        hitches.begin_frame()
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-
-            result = gameover_menu.handle_mouse_event(event, mouse_pos) or gameover_menu.handle_event(event)
-            if result == "retry":
-                versus_loop()  # Restart versus mode
-                return
-            elif result == "main_menu":
-                from menu import main_menu
-                main_menu()  # Return to main menu
-                return
-
-
+        next_scene = scene.update(events, elapsed_ms)
+        scene.draw()
+        profiler.end_frame(scene.entity_counts)
+        hitches.end_frame('versus', scene.entity_counts)
+        if next_scene is not None or scene.winner:
+            break
+        if max_frames is not None and frame_count >= max_frames:
+            break
+    scene.exit()
+    return frame_count